@@ -10,4 +10,7 @@ setup(
         "pydantic>=2.0.0",
     ],
     python_requires=">=3.7",
+    entry_points={
+        "console_scripts": ["task-model-benchmark=task_model.benchmark:main"],
+    },
 )
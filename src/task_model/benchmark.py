@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from .core.base_task import BaseTask
+from .core.composite_task import CompositeTask
+from .core.parameter import Parameter
+from .core.task_result import TaskResult
+
+class NoOpTask(BaseTask):
+    def __init__(self, task_id: str):
+        super().__init__(task_id, "No-op")
+        self.input_params.add(Parameter("value", int, "Input value"))
+        self.output_params.add(Parameter("value", int, "Same value"))
+
+    async def execute(self, input_data: Dict[str, Any]) -> TaskResult:
+        return TaskResult(success=True, data={"value": input_data["value"]})
+
+class JoinTask(BaseTask):
+    def __init__(self, task_id: str, width: int):
+        super().__init__(task_id, "Join")
+        for i in range(width):
+            self.input_params.add(Parameter(f"in{i}", int, "Branch value"))
+        self.output_params.add(Parameter("value", int, "Sum of branch values"))
+
+    async def execute(self, input_data: Dict[str, Any]) -> TaskResult:
+        return TaskResult(success=True, data={"value": sum(input_data.values())})
+
+def build_chain(size: int, **options) -> CompositeTask:
+    composite = CompositeTask("chain", "Chain benchmark", **options)
+    for i in range(size):
+        composite.add_subtask(NoOpTask(f"t{i}"))
+        if i:
+            composite.connect(f"t{i - 1}", "value", f"t{i}", "value")
+    return composite
+
+def build_fan_out(size: int, **options) -> CompositeTask:
+    composite = CompositeTask("fan_out", "Fan-out benchmark", **options)
+    composite.add_subtask(NoOpTask("source"))
+    for i in range(max(size - 1, 1)):
+        composite.add_subtask(NoOpTask(f"t{i}"))
+        composite.connect("source", "value", f"t{i}", "value")
+    return composite
+
+def build_diamond(size: int, **options) -> CompositeTask:
+    width = max(size - 2, 1)
+    composite = CompositeTask("diamond", "Diamond benchmark", **options)
+    composite.add_subtask(NoOpTask("source"))
+    composite.add_subtask(JoinTask("join", width))
+    for i in range(width):
+        composite.add_subtask(NoOpTask(f"t{i}"))
+        composite.connect("source", "value", f"t{i}", "value")
+        composite.connect(f"t{i}", "value", "join", f"in{i}")
+    return composite
+
+def build_nested(size: int, **options) -> CompositeTask:
+    # Chaque niveau contient le niveau précédent suivi d'une tâche alimentée par sa sortie,
+    # comme dans test_nested_composite_tasks
+    inner: BaseTask = NoOpTask("leaf")
+    output = "value"
+    for depth in range(max(size - 1, 1)):
+        composite = CompositeTask(f"level{depth}", f"Nesting level {depth}", **options)
+        composite.add_subtask(inner)
+        composite.add_subtask(NoOpTask("next"))
+        composite.connect(inner.task_id, output, "next", "value")
+        inner, output = composite, "next.value"
+    return inner
+
+SHAPES: Dict[str, Callable[..., CompositeTask]] = {
+    "chain": build_chain,
+    "fan_out": build_fan_out,
+    "diamond": build_diamond,
+    "nested": build_nested,
+}
+
+def count_leaves(task: BaseTask) -> int:
+    if isinstance(task, CompositeTask):
+        return sum(count_leaves(subtask) for subtask in task.subtasks.values())
+    return 1
+
+def required_inputs(task: BaseTask) -> Dict[str, Any]:
+    return {name: 0 for name, param in task.input_params.parameters.items() if not param.optional}
+
+async def _run(task: BaseTask, input_data: Dict[str, Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = await task.execute(input_data)
+        if not result.success:
+            raise RuntimeError(f"Benchmark graph failed: {result.error}")
+    return time.perf_counter() - start
+
+def run_benchmark(shape: str, size: int, iterations: int = 1000, warmup: int = 10, **options) -> Dict[str, Any]:
+    task = SHAPES[shape](size, **options)
+    input_data = required_inputs(task)
+    leaves = count_leaves(task)
+
+    asyncio.run(_run(task, input_data, warmup))
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        elapsed = asyncio.run(_run(task, input_data, iterations))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # Mémoire mesurée dans une passe séparée, tracemalloc ralentissant fortement l'exécution
+    memory_iterations = max(1, min(iterations, 100))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        asyncio.run(_run(task, input_data, memory_iterations))
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    net_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    per_execution = elapsed / iterations
+    return {
+        "shape": shape,
+        "size": size,
+        "subtasks": leaves,
+        "options": options,
+        "iterations": iterations,
+        "executions_per_sec": iterations / elapsed if elapsed else float("inf"),
+        "seconds_per_execution": per_execution,
+        "per_subtask_overhead_us": per_execution / leaves * 1e6,
+        "peak_memory_bytes": peak - baseline,
+        "net_blocks_per_execution": net_blocks / memory_iterations,
+    }
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float = 0.1) -> List[Dict[str, Any]]:
+    # Une régression est signalée lorsque le surcoût par sous-tâche dépasse celui de référence de plus de `tolerance`
+    reference = {(r["shape"], r["size"], json.dumps(r.get("options", {}), sort_keys=True)): r for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result["shape"], result["size"], json.dumps(result.get("options", {}), sort_keys=True))
+        previous = reference.get(key)
+        if previous is None:
+            continue
+        ratio = result["per_subtask_overhead_us"] / previous["per_subtask_overhead_us"]
+        if ratio > 1 + tolerance:
+            regressions.append({"shape": result["shape"], "size": result["size"], "ratio": ratio})
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the framework overhead of CompositeTask execution")
+    parser.add_argument("--shape", choices=sorted(SHAPES), action="append", help="graph shape (repeatable, default: all)")
+    parser.add_argument("--size", type=int, action="append", help="number of subtasks or nesting depth (repeatable, default: 10)")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrent", action="store_true", help="use the concurrent scheduler")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown before reporting a regression")
+    args = parser.parse_args(argv)
+
+    options = {"concurrent": True} if args.concurrent else {}
+    results = []
+    for shape in args.shape or sorted(SHAPES):
+        for size in args.size or [10]:
+            result = run_benchmark(shape, size, args.iterations, args.warmup, **options)
+            results.append(result)
+            print(f"{shape:>8} size={size:<6} {result['executions_per_sec']:>12.1f} exec/s "
+                  f"{result['per_subtask_overhead_us']:>9.2f} us/subtask {result['peak_memory_bytes']:>10} B peak")
+
+    report = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['shape']} size={regression['size']}: {regression['ratio']:.2f}x slower", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
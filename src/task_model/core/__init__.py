@@ -1,4 +1,15 @@
 from .base_task import BaseTask
+from .buffers import SharedBuffer
+from .checkpoint import CheckpointStore
 from .composite_task import CompositeTask
+from .distributed import Coordinator, LocalTransport, Transport
+from .edge_table import EdgeTable
+from .execution_plan import ExecutionPlan
+from .graph_file import GraphFormatError, load_graph, save_graph
+from .instrumentation import ChromeTraceExporter, Instrumentation, Span, SpanAggregator
 from .parameter import Parameter, ParameterSet
+from .result_cache import ResultCache
+from .result_store import ResultStore
+from .serving import ServerOverloaded, TaskServer
+from .streaming_task import Channel, StreamError, StreamingTask
 from .task_result import TaskResult
\ No newline at end of file
@@ -1,25 +1,102 @@
 
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from .fingerprint import FingerprintError, fingerprint_value
+from .instrumentation import Instrumentation, Span
 from .parameter import ParameterSet
 from .task_result import TaskResult
 
 class BaseTask(ABC):
+    # Une tâche déterministe renvoie toujours le même résultat pour les mêmes entrées et peut être mémorisée
+    deterministic: bool = False
+    # Une tâche limitée par le CPU peut être déportée vers l'exécuteur de son CompositeTask
+    cpu_bound: bool = False
+
     def __init__(self, task_id: str, name: str):
         self.task_id = task_id
         self.name = name
         self.input_params = ParameterSet()
         self.output_params = ParameterSet()
+        # Écouteurs d'instrumentation ; sans écouteur, aucun horodatage n'est pris
+        self.listeners: List[Instrumentation] = []
+
+    def add_listener(self, listener: Instrumentation):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Instrumentation):
+        self.listeners.remove(listener)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Les écouteurs sont propres au processus : ils ne suivent pas une tâche sérialisée
+        state = self.__dict__.copy()
+        state["listeners"] = []
+        return state
+
+    def cache_key(self) -> Optional[str]:
+        # Identité de la tâche dans les clés de mémorisation : deux instances configurées différemment
+        # ne partagent pas leurs résultats. Par défaut, empreinte de l'état sérialisé, calculée à la première
+        # utilisation : la configuration est supposée fixée avant la première exécution. None si l'état
+        # n'est pas sérialisable ; la tâche n'est alors pas mémorisée. À surcharger pour une identité explicite.
+        key = self.__dict__.get("_cache_key")
+        if key is None:
+            state = self.__getstate__()
+            state.pop("_cache_key", None)
+            try:
+                key = fingerprint_value(state)
+            except FingerprintError:
+                key = ""
+            self._cache_key = key
+        return key or None
+
+    def _emit(self, span: Span):
+        for listener in self.listeners:
+            listener.on_span(span)
 
     @abstractmethod
     async def execute(self, input_data: Dict[str, Any]) -> TaskResult:
         pass
 
+    async def execute_batch(self, inputs: List[Dict[str, Any]]) -> List[TaskResult]:
+        # Implémentation par défaut élément par élément ; à surcharger pour un traitement vectorisé
+        results = []
+        for input_data in inputs:
+            try:
+                results.append(await self.execute(input_data))
+            except Exception as e:
+                results.append(TaskResult(success=False, error=str(e)))
+        return results
+
     async def _validate_and_execute(self, input_data: Dict[str, Any]) -> TaskResult:
+        if self.listeners:
+            return await self._validate_and_execute_traced(input_data)
+        try:
+            validated_input = self.input_params.validate(input_data)
+            result = await self.execute(validated_input)
+            validated_output = self.output_params.validate(result.data)
+            return TaskResult(success=True, data=validated_output)
+        except Exception as e:
+            return TaskResult(success=False, error=str(e))
+
+
+    async def _validate_and_execute_traced(self, input_data: Dict[str, Any]) -> TaskResult:
+        step = "validate_input"
+        start = time.perf_counter()
         try:
             validated_input = self.input_params.validate(input_data)
+            step_end = time.perf_counter()
+            self._emit(Span(self.task_id, step, self.task_id, start, step_end - start, input_size=len(input_data)))
+
+            step, start = "execute", step_end
             result = await self.execute(validated_input)
+            step_end = time.perf_counter()
+            self._emit(Span(self.task_id, step, self.task_id, start, step_end - start,
+                            input_size=len(validated_input), output_size=len(result.data or {}), success=result.success))
+
+            step, start = "validate_output", step_end
             validated_output = self.output_params.validate(result.data)
+            self._emit(Span(self.task_id, step, self.task_id, start, time.perf_counter() - start, output_size=len(validated_output)))
             return TaskResult(success=True, data=validated_output)
         except Exception as e:
+            self._emit(Span(self.task_id, step, self.task_id, start, time.perf_counter() - start, success=False))
             return TaskResult(success=False, error=str(e))
@@ -0,0 +1,182 @@
+import mmap
+import os
+import pickle
+import tempfile
+import weakref
+from typing import Any, List, Optional, Tuple
+
+# Au-delà de cette taille, un tampon traverse les processus par un fichier projeté en mémoire plutôt que dans le flux pickle
+OUT_OF_BAND_THRESHOLD = 64 * 1024
+
+# /dev/shm est un système de fichiers en mémoire : les fichiers qui y sont projetés sont de la mémoire partagée
+_SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+def _map(path: str, size: int, unlink: bool) -> mmap.mmap:
+    with open(path, "r+b") as f:
+        mapped = mmap.mmap(f.fileno(), size)
+    if unlink:
+        # La projection reste valide après suppression du fichier ; elle est libérée avec la dernière vue
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return mapped
+
+def _spill(data: memoryview) -> str:
+    fd, path = tempfile.mkstemp(prefix="task_model-", dir=_SHARED_DIR)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+class SharedBuffer:
+    # Tampon alloué directement en mémoire partagée : le transmettre à un autre processus ne copie que son chemin.
+    # Le processus qui l'a créé en est propriétaire et doit le garder en vie jusqu'à ce que les destinataires l'aient ouvert.
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        fd, self.path = tempfile.mkstemp(prefix="task_model-", dir=_SHARED_DIR)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+        self.size = size
+        self._mmap = _map(self.path, size, unlink=False)
+        self._finalizer: Optional[weakref.finalize] = weakref.finalize(self, _unlink, self.path)
+
+    @classmethod
+    def from_buffer(cls, data: Any) -> 'SharedBuffer':
+        view = memoryview(data).cast("B")
+        shared = cls(view.nbytes)
+        shared.view[:] = view
+        return shared
+
+    @classmethod
+    def _attach(cls, path: str, size: int) -> 'SharedBuffer':
+        shared = cls.__new__(cls)
+        shared.path = path
+        shared.size = size
+        shared._mmap = _map(path, size, unlink=False)
+        shared._finalizer = None
+        return shared
+
+    @property
+    def view(self) -> memoryview:
+        return memoryview(self._mmap)
+
+    @property
+    def owner(self) -> bool:
+        return self._finalizer is not None
+
+    def release(self):
+        # Supprime le fichier ; les projections déjà ouvertes restent lisibles
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._mmap)
+
+    def __reduce__(self):
+        return SharedBuffer._attach, (self.path, self.size)
+
+    def __repr__(self) -> str:
+        return f"SharedBuffer(path={self.path}, size={self.size})"
+
+def _unpack(payload: bytes, spilled: List[Tuple[str, int]]) -> Any:
+    buffers = [memoryview(_map(path, size, unlink=True)) for path, size in spilled]
+    return pickle.loads(payload, buffers=buffers)
+
+def _view(buffer: Any, format: str, shape: Tuple[int, ...]) -> memoryview:
+    # Un PickleBuffer ne transmet que des octets : le type des éléments et les dimensions de la vue sont rétablis ici
+    return memoryview(buffer).cast("B").cast(format, shape)
+
+class _OutOfBand:
+    # Le pickler C écrit bytes, bytearray et memoryview dans le flux : seul un PickleBuffer passe hors flux
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __reduce__(self):
+        if type(self.value) is memoryview:
+            return _view, (pickle.PickleBuffer(self.value), self.value.format, self.value.shape)
+        return type(self.value), (pickle.PickleBuffer(self.value),)
+
+class _Reduced:
+    # Autres exportateurs de tampon (array.array, tableaux numpy...) : les arguments de leur propre
+    # réduction sont marqués à leur tour, ce qui fait passer hors flux les octets qu'ils contiennent
+    __slots__ = ("value", "threshold")
+
+    def __init__(self, value: Any, threshold: int):
+        self.value = value
+        self.threshold = threshold
+
+    def __reduce__(self):
+        reduced = self.value.__reduce_ex__(5)
+        if isinstance(reduced, str):
+            return reduced
+        return (reduced[0], _mark(reduced[1], self.threshold)) + tuple(reduced[2:])
+
+def _mark(value: Any, threshold: int) -> Any:
+    kind = type(value)
+    if kind is dict:
+        return {key: _mark(item, threshold) for key, item in value.items()}
+    if kind is list or kind is tuple:
+        return kind(_mark(item, threshold) for item in value)
+    if kind is pickle.PickleBuffer:
+        # Déjà hors flux, par exemple dans la réduction d'un tableau numpy
+        return value
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return value
+    if not view.contiguous or view.nbytes < threshold:
+        return value
+    if kind is bytes or kind is bytearray or kind is memoryview:
+        return _OutOfBand(value)
+    return _Reduced(value, threshold)
+
+class PackedValue:
+    # Enveloppe d'une valeur destinée à un autre processus : à la sérialisation, ses grands tampons
+    # (bytes, bytearray, memoryview, array.array, tableaux numpy...) sont écrits hors du flux pickle (protocole 5)
+    # et le destinataire les lit par projection mémoire. Une valeur emballée ne se désérialise qu'une fois.
+    __slots__ = ("value", "threshold")
+
+    def __init__(self, value: Any, threshold: int = OUT_OF_BAND_THRESHOLD):
+        self.value = value
+        self.threshold = threshold
+
+    def __reduce__(self):
+        spilled: List[Tuple[str, int]] = []
+
+        def spill(buffer: pickle.PickleBuffer) -> bool:
+            # Renvoyer True garde le tampon dans le flux ; les grands tampons sont écrits une fois en mémoire partagée
+            try:
+                raw = buffer.raw()
+            except BufferError:
+                return True
+            if raw.nbytes < self.threshold:
+                return True
+            spilled.append((_spill(raw), raw.nbytes))
+            return False
+
+        try:
+            payload = pickle.dumps(_mark(self.value, self.threshold), protocol=5, buffer_callback=spill)
+        except Exception:
+            for path, _ in spilled:
+                _unlink(path)
+            raise
+        return _unpack, (payload, spilled)
+
+def pack(value: Any, threshold: int = OUT_OF_BAND_THRESHOLD) -> Any:
+    if pickle.HIGHEST_PROTOCOL < 5:
+        return value
+    return PackedValue(value, threshold)
@@ -0,0 +1,122 @@
+import os
+import pickle
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+# En-tête d'un enregistrement : CRC32 du reste, longueurs de l'identifiant d'exécution, de la sous-tâche et des sorties.
+# Les identifiants sont lisibles sans désérialiser les sorties.
+_HEADER = struct.Struct("<IHHI")
+# Longueur de sous-tâche réservée à la marque de fin d'exécution
+_COMPLETE = 0xFFFF
+
+class CheckpointStore:
+    # Journal en ajout seul : chaque sous-tâche terminée y ajoute un enregistrement (exécution, sous-tâche, sorties).
+    # Une exécution réussie ajoute une marque de fin qui rend ses enregistrements caducs.
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        # fsync=True protège aussi contre une coupure de courant, au prix d'une synchronisation par enregistrement
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # exécution -> sous-tâche -> (position, longueur) de l'enregistrement le plus récent
+        self._index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._file = open(path, "a+b")
+        self._scan()
+
+    def _scan(self):
+        # Un enregistrement tronqué ou corrompu marque la fin du journal cohérent : la suite est coupée
+        self._file.seek(0)
+        offset = 0
+        while True:
+            header = self._file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            checksum, run_length, task_length, data_length = _HEADER.unpack(header)
+            body_length = run_length + (0 if task_length == _COMPLETE else task_length) + data_length
+            body = self._file.read(body_length)
+            if len(body) < body_length or zlib.crc32(body) != checksum:
+                break
+            run_id = body[:run_length].decode()
+            task_id = None if task_length == _COMPLETE else body[run_length:run_length + task_length].decode()
+            self._apply(run_id, task_id, offset + _HEADER.size + body_length - data_length, data_length)
+            offset += _HEADER.size + body_length
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def _apply(self, run_id: str, task_id: Optional[str], offset: int, length: int):
+        if task_id is None:
+            self._index.pop(run_id, None)
+        else:
+            self._index.setdefault(run_id, {})[task_id] = (offset, length)
+
+    def _append(self, run_id: str, task_id: Optional[str], data: bytes):
+        run_key = run_id.encode()
+        task_key = b"" if task_id is None else task_id.encode()
+        body = run_key + task_key + data
+        header = _HEADER.pack(zlib.crc32(body), len(run_key), _COMPLETE if task_id is None else len(task_key), len(data))
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(header + body)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._apply(run_id, task_id, offset + _HEADER.size + len(body) - len(data), len(data))
+
+    def record(self, run_id: str, task_id: str, data: Dict[str, Any]) -> bool:
+        try:
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Sorties non sérialisables : la sous-tâche sera simplement réexécutée à la reprise
+            return False
+        self._append(run_id, task_id, payload)
+        return True
+
+    def complete(self, run_id: str):
+        if run_id in self._index:
+            self._append(run_id, None, b"")
+
+    def load(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._index.get(run_id, {}).items())
+            restored = {}
+            for task_id, (offset, length) in entries:
+                self._file.seek(offset)
+                restored[task_id] = pickle.loads(self._file.read(length))
+            self._file.seek(0, os.SEEK_END)
+        return restored
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def compact(self):
+        # Réécrit le journal avec les seuls enregistrements encore utiles, puis remplace l'original
+        with self._lock:
+            temporary = f"{self.path}.compact"
+            with open(temporary, "wb") as f:
+                for run_id, tasks in self._index.items():
+                    for task_id, (offset, length) in tasks.items():
+                        self._file.seek(offset)
+                        run_key, task_key, data = run_id.encode(), task_id.encode(), self._file.read(length)
+                        body = run_key + task_key + data
+                        f.write(_HEADER.pack(zlib.crc32(body), len(run_key), len(task_key), len(data)) + body)
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temporary, self.path)
+            self._index.clear()
+            self._file = open(self.path, "a+b")
+            self._scan()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,157 +1,585 @@
+import asyncio
 import logging
-from typing import List, Dict, Any, Tuple
+import time
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Collection, FrozenSet, Iterable, List, Dict, Any, Optional, Tuple
 from .base_task import BaseTask
+from .checkpoint import CheckpointStore
+from .edge_table import EdgeTable
+from .execution_plan import ExecutionPlan
+from .fingerprint import FingerprintError, fingerprint, fingerprint_value
+from .graph_index import GraphIndex
+from .instrumentation import Instrumentation, Span
+from .offload import TaskOffloader
+from .result_cache import ResultCache
+from .result_store import ResultStore
+from .streaming_task import Channel, StreamingTask
 from .task_result import TaskResult
 from .parameter import ParameterValidationError, Parameter, ParameterSet
 
 logger = logging.getLogger(__name__)
 
 class CompositeTask(BaseTask):
-    def __init__(self, task_id: str, name: str):
+    def __init__(self, task_id: str, name: str, concurrent: bool = False, max_concurrency: Optional[int] = None, trusted: bool = False,
+                 flatten: bool = False):
         super().__init__(task_id, name)
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
         self.subtasks: Dict[str, BaseTask] = {}  
-        self.connections: List[Tuple[str, str, str, str]] = []
+        self.connections = EdgeTable()
+        # Index d'adjacence des connexions et ordre topologique incrémental, pour détecter les cycles à l'ajout
+        self.graph = GraphIndex()
+        self.concurrent = concurrent
+        self.max_concurrency = max_concurrency
+        # Mode "confiance" : ne pas revérifier le type des valeurs déjà validées par une sous-tâche composite
+        self.trusted = trusted
+        # Mise à plat : les composites imbriqués sont remplacés par leurs feuilles dans un seul graphe
+        self.flatten = flatten
+        self._plan: Optional[ExecutionPlan] = None
+        self._plan_signature: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._version = 0
+        # Plans réduits aux sorties demandées, valables pour le plan complet auquel ils sont associés
+        self._pruned: Tuple[Optional[ExecutionPlan], Dict[FrozenSet[str], Tuple[ExecutionPlan, ParameterSet, ParameterSet]]] = (None, {})
+        self.result_cache: Optional[ResultCache] = None
+        # (signature de structure, identité) : l'identité d'un composite suit sa structure
+        self._structure_key: Optional[Tuple[Tuple[Tuple[int, int], ...], Optional[str]]] = None
+        # Mode incrémental : les résultats des sous-tâches déterministes sont conservés sur disque
+        self.result_store: Optional[ResultStore] = None
+        self._offloader: Optional[TaskOffloader] = None
+        # Reprise : les sorties de chaque sous-tâche terminée sont journalisées jusqu'à la réussite de l'exécution
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        # Capacité des files créées pour les connexions issues d'une StreamingTask
+        self.stream_buffer_size = 16
         self.logger = logging.getLogger(f"{self.__class__.__name__}.{task_id}")
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Caches et ressources attachés (fichiers, exécuteur) restent propres au processus
+        state = super().__getstate__()
+        state.update(result_cache=None, result_store=None, checkpoint_store=None, _offloader=None, _pruned=(None, {}),
+                     _structure_key=None)
+        return state
+
     def add_subtask(self, task: BaseTask):
-        self.logger.debug(f"Adding subtask: {task.task_id}")
+        self.logger.debug("Adding subtask: %s", task.task_id)
         self.subtasks[task.task_id] = task
+        self.graph.add_node(task.task_id)
+        self._plan = None
+        self._version += 1
         for param in task.input_params.parameters.values():
             full_param_name = f"{task.task_id}.{param.name}"
             self.input_params.add(Parameter(full_param_name, param.type, param.description, param.default, param.optional))
         for param in task.output_params.parameters.values():
             full_param_name = f"{task.task_id}.{param.name}"
-            self.output_params.add(Parameter(full_param_name, param.type, param.description, param.default, True))
-        self.logger.debug(f"Updated input params: {self.input_params.parameters}")
-        self.logger.debug(f"Updated output params: {self.output_params.parameters}")
+            # Les éléments d'une StreamingTask non consommés par une connexion sont rassemblés en liste
+            param_type = list if isinstance(task, StreamingTask) else param.type
+            self.output_params.add(Parameter(full_param_name, param_type, param.description, param.default, True))
+        # Les écouteurs d'un composite suivent aussi ses composites imbriqués
+        if isinstance(task, CompositeTask):
+            for listener in self.listeners:
+                if listener not in task.listeners:
+                    task.add_listener(listener)
+        self.logger.debug("Updated input params: %s", self.input_params.parameters)
+        self.logger.debug("Updated output params: %s", self.output_params.parameters)
 
     def connect(self, from_task: str, from_param: str, to_task: str, to_param: str):
-        self.logger.debug(f"Attempting to connect {from_task}.{from_param} to {to_task}.{to_param}")
-        self.logger.debug(f"Current subtasks: {list(self.subtasks.keys())}")
+        self.logger.debug("Attempting to connect %s.%s to %s.%s", from_task, from_param, to_task, to_param)
+        self._check_connection(from_task, from_param, to_task, to_param)
+        self._add_connection(from_task, from_param, to_task, to_param)
+        self.input_params.invalidate()
+        self.logger.info("Successfully connected %s.%s to %s.%s", from_task, from_param, to_task, to_param)
+
+    def connect_many(self, connections: Iterable[Tuple[str, str, str, str]]):
+        # Chargement en bloc : toutes les connexions sont vérifiées avant d'en ajouter une seule
+        connections = [tuple(connection) for connection in connections]
+        for connection in connections:
+            self._check_connection(*connection)
+        for connection in connections:
+            self._add_connection(*connection, index=False)
+        # L'index est mis à jour en une passe plutôt qu'arête par arête
+        for from_task, to_task in self.graph.add_edges([(connection[0], connection[2]) for connection in connections]):
+            self.logger.warning("Potential circular connection detected between %s and %s", from_task, to_task)
+        self.input_params.invalidate()
+        self.logger.info("Successfully connected %d connections", len(connections))
 
+    def _check_connection(self, from_task: str, from_param: str, to_task: str, to_param: str):
         # Vérifier si les tâches existent
         if from_task not in self.subtasks or to_task not in self.subtasks:
             error_msg = f"Invalid task name: {from_task if from_task not in self.subtasks else to_task}"
             self.logger.error(error_msg)
-            self.logger.debug(f"Available tasks: {list(self.subtasks.keys())}")
+            self.logger.debug("Available tasks: %s", list(self.subtasks))
             raise ValueError(error_msg)
-        
+
         # Vérifier si les paramètres existent
-        from_full_param = f"{from_task}.{from_param}"
-        to_full_param = f"{to_task}.{to_param}"
-        
-        self.logger.debug(f"Checking output parameters for {from_task}: {list(self.subtasks[from_task].output_params.parameters.keys())}")
         if from_param not in self.subtasks[from_task].output_params.parameters:
             error_msg = f"Invalid output parameter: {from_param} for task {from_task}"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
-        
-        self.logger.debug(f"Checking input parameters for {to_task}: {list(self.subtasks[to_task].input_params.parameters.keys())}")
+
         if to_param not in self.subtasks[to_task].input_params.parameters:
             error_msg = f"Invalid input parameter: {to_param} for task {to_task}"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
-        
+
+    def _add_connection(self, from_task: str, from_param: str, to_task: str, to_param: str, index: bool = True):
         # Ajouter la connexion
         self.connections.append((from_task, from_param, to_task, to_param))
-        self.logger.info(f"Successfully connected {from_full_param} to {to_full_param}")
-        
-        # Rendre le paramètre cible optionnel
-        self.logger.debug(f"Current input parameters: {list(self.input_params.parameters.keys())}")
-        if to_full_param in self.input_params.parameters:
-            self.input_params.parameters[to_full_param].optional = True
-            self.logger.debug(f"Made {to_full_param} optional due to connection")
+        self._plan = None
+        self._version += 1
+
+        # Rendre le paramètre cible optionnel ; l'appelant invalide le validateur compilé
+        to_full_param = f"{to_task}.{to_param}"
+        param = self.input_params.parameters.get(to_full_param)
+        if param is not None:
+            param.optional = True
         else:
-            self.logger.warning(f"{to_full_param} not found in input parameters, could not make it optional")
-        
-        # Vérifier les connexions circulaires
-        if self._check_circular_connection(from_task, to_task):
-            warning_msg = f"Potential circular connection detected between {from_task} and {to_task}"
-            self.logger.warning(warning_msg)
-        
-        self.logger.debug(f"Current connections: {self.connections}")
-        self.logger.debug(f"Updated input parameters: {list(self.input_params.parameters.keys())}")
-
-    def _check_circular_connection(self, from_task: str, to_task: str) -> bool:
-        visited = set()
-        def dfs(task):
-            visited.add(task)
-            for _, _, next_task, _ in self.connections:
-                if next_task == from_task:
-                    return True
-                if next_task not in visited:
-                    if dfs(next_task):
-                        return True
-            return False
-        return dfs(to_task)
-
-    def _apply_connections(self, results: Dict[str, Any]) -> Dict[str, Any]:
+            self.logger.warning("%s not found in input parameters, could not make it optional", to_full_param)
+
+        # Vérifier les connexions circulaires ; connect_many indexe ses arêtes en bloc
+        if index and not self.graph.add_edge(from_task, to_task):
+            self.logger.warning("Potential circular connection detected between %s and %s", from_task, to_task)
+
+    def add_listener(self, listener: Instrumentation):
+        super().add_listener(listener)
+        for subtask in self.subtasks.values():
+            if isinstance(subtask, CompositeTask) and listener not in subtask.listeners:
+                subtask.add_listener(listener)
+
+    def remove_listener(self, listener: Instrumentation):
+        super().remove_listener(listener)
+        for subtask in self.subtasks.values():
+            if isinstance(subtask, CompositeTask) and listener in subtask.listeners:
+                subtask.remove_listener(listener)
+
+    def compile(self) -> ExecutionPlan:
+        if not self.flatten:
+            if self._plan is None:
+                self._plan = ExecutionPlan.build(self.subtasks, self.connections)
+                self.logger.debug("Compiled execution plan: %s", self._plan)
+            return self._plan
+
+        # Un plan mis à plat dépend aussi de la structure des composites imbriqués
+        signature = self._structure_signature()
+        if self._plan is None or signature != self._plan_signature:
+            leaves, connections = self.flattened()
+            self._plan = ExecutionPlan.build(leaves, connections)
+            self._plan_signature = signature
+            self.logger.debug("Compiled flattened execution plan: %s", self._plan)
+        return self._plan
+
+    def prune(self, outputs: Collection[str]) -> Tuple[ExecutionPlan, ParameterSet, ParameterSet]:
+        # Plan et paramètres d'entrée/sortie restreints aux sous-tâches nécessaires aux sorties demandées
+        plan = self.compile()
+        if self._pruned[0] is not plan:
+            self._pruned = (plan, {})
+        key = frozenset(outputs)
+        pruned = self._pruned[1].get(key)
+        if pruned is None:
+            pruned_plan = plan.prune(key)
+            input_keys = {f"{task_id}.{local_key}" for task_id in pruned_plan.order for local_key, _ in pruned_plan.reads[task_id]}
+            pruned = (pruned_plan, self.input_params.subset(input_keys), self.output_params.subset(key))
+            self._pruned[1][key] = pruned
+            self.logger.debug("Pruned execution plan for %s: %s", sorted(key), pruned_plan)
+        return pruned
+
+    def _structure_signature(self) -> Tuple[Tuple[int, int], ...]:
+        signature = [(id(self), self._version)]
+        for subtask in self.subtasks.values():
+            if isinstance(subtask, CompositeTask):
+                signature.extend(subtask._structure_signature())
+        return tuple(signature)
+
+    def cache_key(self) -> Optional[str]:
+        # L'identité d'un composite est celle de sa structure : identités des sous-tâches et connexions
+        signature = self._structure_signature()
+        if self._structure_key is None or self._structure_key[0] != signature:
+            subtasks = {}
+            key = None
+            for task_id, subtask in self.subtasks.items():
+                identity = subtask.cache_key()
+                if identity is None:
+                    break
+                subtasks[task_id] = (f"{type(subtask).__module__}.{type(subtask).__qualname__}", identity)
+            else:
+                key = fingerprint_value({"subtasks": subtasks, "connections": list(self.connections)})
+            self._structure_key = (signature, key)
+        return self._structure_key[1]
+
+    def flattened(self) -> Tuple[Dict[str, BaseTask], List[Tuple[str, str, str, str]]]:
+        # Les feuilles sont renommées par leur chemin ("inner.add_task") : les clés d'entrée et de sortie
+        # du composite ("inner.add_task.a") restent donc identiques à celles de l'exécution imbriquée
+        leaves: Dict[str, BaseTask] = {}
+        connections: List[Tuple[str, str, str, str]] = []
+        self._flatten_into("", leaves, connections)
+        return leaves, connections
+
+    def _flatten_into(self, prefix: str, leaves: Dict[str, BaseTask], connections: List[Tuple[str, str, str, str]]):
+        # Les connexions d'un composite précèdent celles des composites qu'il contient : la dernière connexion
+        # l'emportant, une connexion interne reste prioritaire sur une connexion extérieure vers le même paramètre,
+        # comme lors de l'exécution imbriquée
         for from_task, from_param, to_task, to_param in self.connections:
-            from_parts = from_task.split('.')
-            to_parts = to_task.split('.')
-            from_value = results
-            for part in from_parts:
-                from_value = from_value.get(part, {})
-            if from_param in from_value:
-                to_value = results
-                for part in to_parts[:-1]:
-                    if part not in to_value:
-                        to_value[part] = {}
-                    to_value = to_value[part]
-                to_value[to_parts[-1]] = {to_param: from_value[from_param]}
+            source_task, source_param = self._resolve_leaf(prefix, from_task, from_param, "output_params")
+            target_task, target_param = self._resolve_leaf(prefix, to_task, to_param, "input_params")
+            connections.append((source_task, source_param, target_task, target_param))
+        for task_id, subtask in self.subtasks.items():
+            if isinstance(subtask, CompositeTask):
+                subtask._flatten_into(f"{prefix}{task_id}.", leaves, connections)
+            else:
+                leaves[f"{prefix}{task_id}"] = subtask
+
+    def _resolve_leaf(self, prefix: str, task_id: str, param: str, params_attr: str) -> Tuple[str, str]:
+        # Un paramètre "sous_tache.param" d'un composite imbriqué désigne le paramètre d'une de ses sous-tâches
+        subtask = self.subtasks[task_id]
+        while isinstance(subtask, CompositeTask):
+            prefix = f"{prefix}{task_id}."
+            for child_id in subtask.subtasks:
+                if param.startswith(f"{child_id}.") and param[len(child_id) + 1:] in getattr(subtask.subtasks[child_id], params_attr).parameters:
+                    task_id, param = child_id, param[len(child_id) + 1:]
+                    break
+            else:
+                raise ValueError(f"Cannot resolve {param} in nested composite {prefix[:-1]}")
+            subtask = subtask.subtasks[task_id]
+        return f"{prefix}{task_id}", param
+
+    @staticmethod
+    def _lookup(data: Dict[str, Any], keys: Tuple[str, ...]) -> Tuple[bool, Any]:
+        for key in keys:
+            if key in data:
+                return True, data[key]
+        return False, None
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        return self._offloader.executor if self._offloader is not None else None
+
+    @executor.setter
+    def executor(self, executor: Optional[Executor]):
+        # Exécuteur (ProcessPoolExecutor ou ThreadPoolExecutor) pour les sous-tâches marquées cpu_bound
+        self._offloader = TaskOffloader(executor) if executor is not None else None
+
+    @property
+    def deterministic(self) -> bool:
+        return all(subtask.deterministic for subtask in self.subtasks.values())
+
+    def _checkpoint_run(self, plan: ExecutionPlan, validated_input: Dict[str, Any]) -> Optional[str]:
+        # Une exécution est reprise si elle porte sur les mêmes entrées, la même structure de graphe
+        # et les mêmes sous-tâches : une exécution élaguée ne clôt pas celle du graphe complet
+        try:
+            return fingerprint(self.task_id, {"input": validated_input, "slots": plan.slot_names, "order": plan.order})
+        except FingerprintError:
+            return None
+
+    async def _run_subtask(self, subtask: BaseTask, subtask_input: Dict[str, Any]) -> TaskResult:
+        if subtask.deterministic and (self.result_cache is not None or self.result_store is not None):
+            key = ResultCache.make_key(subtask, subtask_input)
+            if key is not None:
+                if self.result_cache is not None:
+                    return await self.result_cache.get_or_execute(key, lambda: self._run_stored(subtask, subtask_input, key))
+                return await self._run_stored(subtask, subtask_input, key)
+        return await self._invoke_subtask(subtask, subtask_input)
+
+    async def _run_stored(self, subtask: BaseTask, subtask_input: Dict[str, Any], key: str) -> TaskResult:
+        if self.result_store is not None:
+            data = self.result_store.get(key)
+            if data is not None:
+                self.logger.debug("Subtask %s unchanged, reusing stored result", subtask.task_id)
+                return TaskResult(success=True, data=data)
+        result = await self._invoke_subtask(subtask, subtask_input)
+        if self.result_store is not None and result.success:
+            self.result_store.put(key, subtask.task_id, result.data)
+        return result
+
+    async def _invoke_subtask(self, subtask: BaseTask, subtask_input: Dict[str, Any]) -> TaskResult:
+        self.logger.debug("Subtask %s input: %s", subtask.task_id, subtask_input)
+        try:
+            if subtask.cpu_bound and self._offloader is not None:
+                result = await self._offloader.run(subtask, subtask_input)
+            elif self.trusted and isinstance(subtask, CompositeTask):
+                result = await subtask.execute(subtask_input, trusted_keys=self.compile().trusted_inputs[subtask.task_id])
+            else:
+                result = await subtask.execute(subtask_input)
+            self.logger.debug("Subtask %s result: %s", subtask.task_id, result)
+        except Exception as e:
+            self.logger.error("Error executing subtask %s: %s", subtask.task_id, e)
+            return TaskResult(success=False, error=f"Error in subtask {subtask.task_id}: {str(e)}")
+        return result
+
+    async def _run_stream(self, subtask: StreamingTask, subtask_input: Dict[str, Any],
+                          outgoing: List[Tuple[Tuple[str, ...], Channel]]) -> TaskResult:
+        # Chaque élément produit est poussé dans les files aval ; seules les sorties non consommées sont rassemblées
+        consumed = {key for source_keys, _ in outgoing for key in source_keys}
+        collected: Dict[str, List[Any]] = {}
+        error = None
+        try:
+            async for item in subtask.stream(subtask_input):
+                for source_keys, channel in outgoing:
+                    found, value = self._lookup(item, source_keys)
+                    if found:
+                        await channel.put(value)
+                for key, value in item.items():
+                    if key not in consumed:
+                        collected.setdefault(key, []).append(value)
+        except Exception as e:
+            self.logger.error("Error executing subtask %s: %s", subtask.task_id, e)
+            error = f"Error in subtask {subtask.task_id}: {str(e)}"
+        finally:
+            for _, channel in outgoing:
+                channel.close(error)
+        if error is not None:
+            return TaskResult(success=False, error=error)
+        return TaskResult(success=True, data=collected)
+
+    async def _run_subtask_batch(self, subtask: BaseTask, batch: List[Dict[str, Any]]) -> List[TaskResult]:
+        # Mêmes règles qu'à l'unité : déport des sous-tâches cpu_bound, mémorisation des sous-tâches déterministes
+        if subtask.cpu_bound and self._offloader is not None:
+            # Chaque élément est déporté séparément : les éléments du lot occupent les travailleurs de l'exécuteur
+            return list(await asyncio.gather(*(self._run_subtask(subtask, item) for item in batch)))
+        keys: List[Optional[str]] = [None] * len(batch)
+        if subtask.deterministic and (self.result_cache is not None or self.result_store is not None):
+            keys = [ResultCache.make_key(subtask, item) for item in batch]
+        results: List[Optional[TaskResult]] = [self._recall(key) if key is not None else None for key in keys]
+
+        # Seuls les éléments absents des caches sont transmis à execute_batch
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            item_results = await self._execute_subtask_batch(subtask, [batch[i] for i in missing])
+            for i, result in zip(missing, item_results):
+                results[i] = result
+                if keys[i] is not None and result.success:
+                    if self.result_store is not None:
+                        self.result_store.put(keys[i], subtask.task_id, result.data)
+                    if self.result_cache is not None:
+                        self.result_cache.put(keys[i], result)
         return results
 
-    async def execute(self, input_data: Dict[str, Any]) -> TaskResult:
-        self.logger.debug(f"Executing CompositeTask: {self.name}")
-        self.logger.debug(f"Input data: {input_data}")
+    def _recall(self, key: str) -> Optional[TaskResult]:
+        if self.result_cache is not None:
+            result = self.result_cache.get(key)
+            if result is not None:
+                return result
+        if self.result_store is not None:
+            data = self.result_store.get(key)
+            if data is not None:
+                result = TaskResult(success=True, data=data)
+                if self.result_cache is not None:
+                    self.result_cache.put(key, result)
+                return result
+        return None
+
+    async def _execute_subtask_batch(self, subtask: BaseTask, batch: List[Dict[str, Any]]) -> List[TaskResult]:
+        try:
+            item_results = await subtask.execute_batch(batch)
+        except Exception as e:
+            self.logger.error("Error executing subtask %s on a batch: %s", subtask.task_id, e)
+            failure = TaskResult(success=False, error=f"Error in subtask {subtask.task_id}: {str(e)}")
+            return [failure] * len(batch)
+        if len(item_results) != len(batch):
+            failure = TaskResult(success=False, error=f"Error in subtask {subtask.task_id}: expected {len(batch)} results, got {len(item_results)}")
+            return [failure] * len(batch)
+        return item_results
+
+    async def _schedule(self, plan: ExecutionPlan, step: Callable[[str, float], Awaitable[Optional[TaskResult]]]) -> Optional[TaskResult]:
+        # `step` exécute une sous-tâche et renvoie un TaskResult en échec pour interrompre l'exécution.
+        # Les files entre producteur et consommateur imposent l'exécution concurrente.
+        if not self.concurrent and not plan.streaming:
+            for task_id in plan.order:
+                failure = await step(task_id, 0.0)
+                if failure is not None:
+                    return failure
+            return None
+
+        position = {task_id: i for i, task_id in enumerate(plan.order)}
+        waiting = {task_id: len(plan.dependencies[task_id]) for task_id in plan.order}
+        ready = [task_id for task_id in plan.order if waiting[task_id] == 0]
+        running: Dict[asyncio.Task, str] = {}
+        limit = self.max_concurrency or len(plan.order)
+        throttled = 0
+        # Attente entre le moment où une sous-tâche est prête et son démarrage, mesurée seulement si instrumenté
+        traced = bool(self.listeners)
+        ready_at = dict.fromkeys(ready, time.perf_counter()) if traced else {}
 
         try:
-            validated_input = self.input_params.validate(input_data)
-            self.logger.debug(f"Validated input: {validated_input}")
+            while ready or running:
+                # Démarrer chaque sous-tâche dès que toutes ses entrées amont sont disponibles.
+                # Les tâches reliées par une file ne comptent pas dans la limite, sinon producteur et
+                # consommateur pourraient s'attendre mutuellement.
+                for task_id in list(ready):
+                    if task_id in plan.unthrottled:
+                        ready.remove(task_id)
+                    elif throttled < limit:
+                        ready.remove(task_id)
+                        throttled += 1
+                    else:
+                        continue
+                    queue_wait = time.perf_counter() - ready_at.pop(task_id) if traced else 0.0
+                    running[asyncio.ensure_future(step(task_id, queue_wait))] = task_id
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: position[running[f]]):
+                    task_id = running.pop(future)
+                    if task_id not in plan.unthrottled:
+                        throttled -= 1
+                    failure = future.result()
+                    if failure is not None:
+                        return failure
+                    for downstream in plan.dependents[task_id]:
+                        waiting[downstream] -= 1
+                        if waiting[downstream] == 0:
+                            ready.append(downstream)
+                            if traced:
+                                ready_at[downstream] = time.perf_counter()
+                ready.sort(key=position.__getitem__)
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        return None
+
+    async def execute(self, input_data: Dict[str, Any], trusted_keys: Optional[Collection[str]] = None,
+                      outputs: Optional[Collection[str]] = None) -> TaskResult:
+        self.logger.debug("Executing CompositeTask: %s", self.name)
+        self.logger.debug("Input data: %s", input_data)
+        traced = bool(self.listeners)
+        if traced:
+            started = time.perf_counter()
+
+        # Avec `outputs`, seules les sous-tâches dont dépendent ces sorties sont exécutées et validées
+        if outputs is None:
+            plan, input_params, output_params = self.compile(), self.input_params, self.output_params
+        else:
+            try:
+                plan, input_params, output_params = self.prune(outputs)
+            except ValueError as e:
+                self.logger.error("Output selection failed: %s", e)
+                return TaskResult(success=False, error=str(e))
+
+        try:
+            validated_input = input_params.validate(input_data, trusted_keys)
+            self.logger.debug("Validated input: %s", validated_input)
         except ParameterValidationError as e:
-            self.logger.error(f"Input validation failed: {str(e)}")
+            self.logger.error("Input validation failed: %s", e)
+            if traced:
+                self._emit(Span(self.task_id, "validate_input", self.task_id, started, time.perf_counter() - started,
+                                input_size=len(input_data), success=False))
             return TaskResult(success=False, error=str(e))
+        if traced:
+            self._emit(Span(self.task_id, "validate_input", self.task_id, started, time.perf_counter() - started,
+                            input_size=len(input_data)))
 
-        results = {self.task_id: validated_input}
-        for subtask in self.subtasks.values():
-            subtask_input = {k.split('.')[-1]: v for k, v in validated_input.items() if k.startswith(f"{subtask.task_id}.")}
-            
-            # Appliquer les connexions avant d'exécuter la sous-tâche
-            for from_task, from_param, to_task, to_param in self.connections:
-                if to_task == subtask.task_id and from_task in results:
-                    from_full_param = f"{from_task}.{from_param}"
-                    if from_full_param in results[from_task]:
-                        subtask_input[to_param] = results[from_task][from_full_param]
-            
-            self.logger.debug(f"Subtask {subtask.task_id} input: {subtask_input}")
-            
-            try:
-                result = await subtask.execute(subtask_input)
-                self.logger.debug(f"Subtask {subtask.task_id} result: {result}")
-            except Exception as e:
-                self.logger.error(f"Error executing subtask {subtask.task_id}: {str(e)}")
-                return TaskResult(success=False, error=f"Error in subtask {subtask.task_id}: {str(e)}")
-            
+        slots = plan.new_slots()
+        plan.load_input(slots, validated_input)
+        channels = {edge_index: Channel(self.stream_buffer_size)
+                    for routes in plan.stream_inputs.values() for edge_index, _ in routes}
+        run_id = self._checkpoint_run(plan, validated_input) if self.checkpoint_store is not None else None
+        restored = self.checkpoint_store.load(run_id) if run_id is not None else {}
+        if restored:
+            self.logger.info("Resuming run %s: %d subtasks already completed", run_id, len(restored))
+
+        async def step(task_id: str, queue_wait: float) -> Optional[TaskResult]:
+            # Les sous-tâches reliées par une file ne sont pas journalisées : leurs éléments ne sont pas conservés
+            checkpointed = run_id is not None and task_id not in plan.unthrottled
+            if checkpointed and task_id in restored:
+                plan.write(slots, task_id, restored[task_id])
+                return None
+            subtask = plan.tasks[task_id]
+            if traced:
+                start = time.perf_counter()
+            subtask_input = plan.read(slots, task_id)
+            for edge_index, to_param in plan.stream_inputs[task_id]:
+                subtask_input[to_param] = channels[edge_index]
+            if isinstance(subtask, StreamingTask):
+                outgoing = [(source_keys, channels[edge_index]) for edge_index, source_keys in plan.stream_outputs[task_id]]
+                result = await self._run_stream(subtask, subtask_input, outgoing)
+            else:
+                result = await self._run_subtask(subtask, subtask_input)
+            for edge_index, _ in plan.stream_inputs[task_id]:
+                channels[edge_index].abandon()
+            if traced:
+                self._emit(Span(task_id, "subtask", self.task_id, start, time.perf_counter() - start, queue_wait,
+                                len(subtask_input), len(result.data or {}), result.success))
             if not result.success:
                 return result
-            
-            results[subtask.task_id] = result.data
-            self.logger.debug(f"Updated results after subtask {subtask.task_id}: {results}")
+            if checkpointed:
+                self.checkpoint_store.record(run_id, task_id, result.data)
+            plan.write(slots, task_id, result.data)
+            return None
 
-        final_results = self._apply_connections(results)
-        self.logger.debug(f"Final results after applying all connections: {final_results}")
+        failure = await self._schedule(plan, step)
+        if failure is not None:
+            if traced:
+                self._emit(Span(self.task_id, "composite", self.task_id, started, time.perf_counter() - started,
+                                input_size=len(input_data), success=False))
+            return failure
 
-        output_data = {}
-        for task_results in final_results.values():
-            if isinstance(task_results, dict):
-                output_data.update(task_results)
+        output_data = plan.collect_output(slots)
 
-        self.logger.debug(f"Output data before validation: {output_data}")
+        self.logger.debug("Output data before validation: %s", output_data)
 
+        if traced:
+            validation_start = time.perf_counter()
         try:
-            validated_output = self.output_params.validate(output_data)
-            self.logger.debug(f"Validated output: {validated_output}")
-            return TaskResult(success=True, data=validated_output)
+            validated_output = output_params.validate(output_data, plan.validated_outputs if self.trusted else None)
+            self.logger.debug("Validated output: %s", validated_output)
+            result = TaskResult(success=True, data=validated_output)
+            if run_id is not None:
+                self.checkpoint_store.complete(run_id)
         except ParameterValidationError as e:
-            self.logger.error(f"Output validation failed: {str(e)}")
-            return TaskResult(success=False, error=f"Output validation failed: {str(e)}")
\ No newline at end of file
+            self.logger.error("Output validation failed: %s", e)
+            result = TaskResult(success=False, error=f"Output validation failed: {str(e)}")
+        if traced:
+            end = time.perf_counter()
+            self._emit(Span(self.task_id, "validate_output", self.task_id, validation_start, end - validation_start,
+                            output_size=len(output_data), success=result.success))
+            self._emit(Span(self.task_id, "composite", self.task_id, started, end - started, input_size=len(input_data),
+                            output_size=len(result.data or {}), success=result.success))
+        return result
+
+    async def execute_batch(self, inputs: List[Dict[str, Any]]) -> List[TaskResult]:
+        self.logger.debug("Executing CompositeTask batch: %s (%d items)", self.name, len(inputs))
+
+        plan = self.compile()
+        if plan.streaming:
+            # Les files d'une exécution en flux ne se partagent pas entre éléments d'un lot
+            return [await self.execute(input_data) for input_data in inputs]
+
+        outcomes: List[Optional[TaskResult]] = [None] * len(inputs)
+        batch_slots: List[List[Any]] = []
+        for i, input_data in enumerate(inputs):
+            slots = plan.new_slots()
+            try:
+                plan.load_input(slots, self.input_params.validate(input_data))
+            except ParameterValidationError as e:
+                outcomes[i] = TaskResult(success=False, error=str(e))
+            batch_slots.append(slots)
+
+        async def step(task_id: str, queue_wait: float) -> Optional[TaskResult]:
+            # Les éléments en échec sont retirés du lot transmis aux sous-tâches suivantes
+            alive = [i for i, outcome in enumerate(outcomes) if outcome is None]
+            if not alive:
+                return None
+            if self.listeners:
+                start = time.perf_counter()
+            batch = [plan.read(batch_slots[i], task_id) for i in alive]
+            item_results = await self._run_subtask_batch(plan.tasks[task_id], batch)
+            if self.listeners:
+                self._emit(Span(task_id, "subtask_batch", self.task_id, start, time.perf_counter() - start, queue_wait,
+                                len(batch), len(item_results), all(result.success for result in item_results)))
+            for i, result in zip(alive, item_results):
+                if outcomes[i] is not None:
+                    continue
+                if result.success:
+                    plan.write(batch_slots[i], task_id, result.data)
+                else:
+                    outcomes[i] = result
+            return None
+
+        await self._schedule(plan, step)
+
+        for i, outcome in enumerate(outcomes):
+            if outcome is not None:
+                continue
+            try:
+                outcomes[i] = TaskResult(success=True, data=self.output_params.validate(plan.collect_output(batch_slots[i])))
+            except ParameterValidationError as e:
+                outcomes[i] = TaskResult(success=False, error=f"Output validation failed: {str(e)}")
+        return outcomes
@@ -0,0 +1,302 @@
+import asyncio
+import os
+import pickle
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .base_task import BaseTask
+from .buffers import pack
+from .composite_task import CompositeTask
+from .execution_plan import ExecutionPlan
+from .offload import OffloadError, WireResult, _execute
+from .parameter import Parameter, ParameterValidationError
+from .task_result import TaskResult
+
+class TaskChain(BaseTask):
+    # Suite de sous-tâches reliées bout à bout et confiée à un même processus de travail :
+    # les valeurs intermédiaires de la chaîne ne traversent pas le réseau
+    def __init__(self, task_id: str, members: Dict[str, BaseTask], connections: List[Tuple[str, str, str, str]]):
+        super().__init__(task_id, f"Chain of {len(members)} subtasks")
+        self.members = members
+        self.connections = connections
+        for name, task in members.items():
+            for param in task.input_params.parameters.values():
+                self.input_params.add(Parameter(f"{name}.{param.name}", param.type, param.description, param.default, True))
+            for param in task.output_params.parameters.values():
+                self.output_params.add(Parameter(f"{name}.{param.name}", param.type, param.description, param.default, True))
+        self._plan: Optional[ExecutionPlan] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Le plan est reconstruit dans le processus de travail
+        state = super().__getstate__()
+        state["_plan"] = None
+        return state
+
+    async def execute(self, input_data: Dict[str, Any]) -> TaskResult:
+        if self._plan is None:
+            self._plan = ExecutionPlan.build(self.members, self.connections)
+        plan = self._plan
+        slots = plan.new_slots()
+        plan.load_input(slots, input_data)
+        for name in plan.order:
+            try:
+                result = await plan.tasks[name].execute(plan.read(slots, name))
+            except Exception as e:
+                return TaskResult(success=False, error=f"Error in subtask {name}: {str(e)}")
+            if not result.success:
+                return result
+            plan.write(slots, name, result.data)
+        return TaskResult(success=True, data=plan.collect_output(slots))
+
+class Transport(ABC):
+    # Acheminement des chaînes vers les processus de travail, qu'ils soient locaux ou distants.
+    # Une tâche n'est transmise qu'une fois par processus : les appels suivants ne portent que son jeton.
+    @property
+    @abstractmethod
+    def workers(self) -> int:
+        pass
+
+    @abstractmethod
+    async def run(self, worker: int, token: str, payload: Optional[bytes], input_data: Dict[str, Any]) -> WireResult:
+        pass
+
+    async def forget(self, worker: int, tokens: List[str]):
+        # Retire des tâches du registre d'un processus de travail ; un jeton oublié doit être retransmis avec sa tâche
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> 'Transport':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def serve(address: Tuple[str, int], authkey: bytes):
+    # Boucle d'un processus de travail : (jeton, tâche sérialisée ou None, entrée) -> WireResult,
+    # ou (None, jetons à oublier, None) sans réponse
+    tasks: Dict[str, BaseTask] = {}
+    with Client(address, authkey=authkey) as connection:
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                return
+            if message is None:
+                return
+            token, payload, input_data = message
+            if token is None:
+                for forgotten in payload:
+                    tasks.pop(forgotten, None)
+                continue
+            if payload is not None:
+                tasks[token] = pickle.loads(payload)
+            task = tasks.get(token)
+            if task is None:
+                connection.send((False, None, f"Unknown task token {token}", True))
+            else:
+                success, data, error, raised = _execute(task, input_data)
+                connection.send((success, pack(data), error, raised))
+
+class LocalTransport(Transport):
+    # Processus de travail locaux reliés au coordinateur par socket, à la place de nœuds distants
+    def __init__(self, workers: int = 2, start_method: Optional[str] = None):
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        authkey = os.urandom(16)
+        self._listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        context = get_context(start_method)
+        self._processes = [context.Process(target=serve, args=(self._listener.address, authkey), daemon=True)
+                           for _ in range(workers)]
+        for process in self._processes:
+            process.start()
+        self._connections: List[Connection] = [self._listener.accept() for _ in range(workers)]
+        # Un fil par processus de travail : les échanges sur une même connexion restent séquentiels
+        self._threads = [ThreadPoolExecutor(max_workers=1) for _ in range(workers)]
+
+    @property
+    def workers(self) -> int:
+        return len(self._connections)
+
+    def _call(self, worker: int, message: Tuple[str, Optional[bytes], Any]) -> WireResult:
+        connection = self._connections[worker]
+        connection.send(message)
+        return connection.recv()
+
+    async def run(self, worker: int, token: str, payload: Optional[bytes], input_data: Dict[str, Any]) -> WireResult:
+        # Les processus de travail partagent la machine : les grands tampons passent par mémoire partagée
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._threads[worker], self._call, worker, (token, payload, pack(input_data)))
+
+    async def forget(self, worker: int, tokens: List[str]):
+        # Même fil que les exécutions : le message part après celles déjà en cours sur ce processus
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self._threads[worker], self._connections[worker].send, (None, list(tokens), None))
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for thread in self._threads:
+            thread.shutdown()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._listener.close()
+        self._connections = []
+
+class Coordinator:
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        # Composite -> (signature de structure, plan, chaînes, jetons, affectation des chaînes aux processus, finaliseur).
+        # Les clés sont faibles : un graphe libéré ne peut pas être confondu avec un nouveau graphe à la même adresse.
+        self._partitions: 'weakref.WeakKeyDictionary[CompositeTask, Tuple[Any, ExecutionPlan, List[TaskChain], List[str], List[int], weakref.finalize]]' = weakref.WeakKeyDictionary()
+        self._payloads: Dict[str, bytes] = {}
+        # Jeton -> processus de travail qui ont déjà reçu la tâche
+        self._delivered: Dict[str, Set[int]] = {}
+        # Jetons des partitions remplacées ou libérées, à retirer des processus de travail
+        self._retired: List[str] = []
+
+    @staticmethod
+    def chains(plan: ExecutionPlan) -> List[List[str]]:
+        # Une sous-tâche rejoint la chaîne de son unique prédécesseur lorsqu'elle en est l'unique successeur
+        chains: List[List[str]] = []
+        chain_of: Dict[str, int] = {}
+        for task_id in plan.order:
+            dependencies = plan.dependencies[task_id]
+            if len(dependencies) == 1:
+                source = next(iter(dependencies))
+                chain = chains[chain_of[source]]
+                if len(plan.dependents[source]) == 1 and chain[-1] == source:
+                    chain_of[task_id] = chain_of[source]
+                    chain.append(task_id)
+                    continue
+            chain_of[task_id] = len(chains)
+            chains.append([task_id])
+        return chains
+
+    def partition(self, composite: CompositeTask) -> Tuple[ExecutionPlan, List[TaskChain], List[str], List[int]]:
+        signature = composite._structure_signature()
+        cached = self._partitions.get(composite)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2], cached[3], cached[4]
+
+        leaves, connections = composite.flattened()
+        plan = ExecutionPlan.build(leaves, connections)
+        if plan.streaming:
+            raise ValueError("Streaming subtasks cannot be distributed")
+        chains = []
+        for i, names in enumerate(self.chains(plan)):
+            members = {name: plan.tasks[name] for name in names}
+            internal = [edge for edge in connections if edge[0] in members and edge[2] in members]
+            chains.append(TaskChain(f"{composite.task_id}.chain{i}", members, internal))
+
+        # Les chaînes les plus longues sont placées d'abord, chacune sur le processus le moins chargé
+        load = [0] * self.transport.workers
+        assignment = [0] * len(chains)
+        for i in sorted(range(len(chains)), key=lambda i: -len(chains[i].members)):
+            worker = load.index(min(load))
+            assignment[i] = worker
+            load[worker] += len(chains[i].members)
+
+        tokens = [uuid.uuid4().hex for _ in chains]
+        for token, chain in zip(tokens, chains):
+            self._payloads[token] = pickle.dumps(chain, protocol=pickle.HIGHEST_PROTOCOL)
+        if cached is not None:
+            cached[5].detach()
+            self._retired.extend(cached[3])
+        # Les jetons d'un graphe libéré sont retirés à la prochaine exécution
+        finalizer = weakref.finalize(composite, self._retired.extend, tokens)
+        self._partitions[composite] = (signature, plan, chains, tokens, assignment, finalizer)
+        return plan, chains, tokens, assignment
+
+    async def _release(self):
+        # La liste est vidée sur place : les finaliseurs gardent une référence à sa méthode extend
+        retired = list(self._retired)
+        del self._retired[:]
+        forgotten: Dict[int, List[str]] = {}
+        for token in retired:
+            self._payloads.pop(token, None)
+            for worker in self._delivered.pop(token, ()):
+                forgotten.setdefault(worker, []).append(token)
+        for worker, tokens in forgotten.items():
+            await self.transport.forget(worker, tokens)
+
+    async def _run_chain(self, worker: int, token: str, input_data: Dict[str, Any]) -> TaskResult:
+        workers = self._delivered.setdefault(token, set())
+        payload = None if worker in workers else self._payloads[token]
+        success, data, error, raised = await self.transport.run(worker, token, payload, input_data)
+        workers.add(worker)
+        if raised:
+            raise OffloadError(error)
+        return TaskResult(success=success, data=data, error=error)
+
+    async def execute(self, composite: CompositeTask, input_data: Dict[str, Any]) -> TaskResult:
+        try:
+            validated_input = composite.input_params.validate(input_data)
+        except ParameterValidationError as e:
+            return TaskResult(success=False, error=str(e))
+
+        plan, chains, tokens, assignment = self.partition(composite)
+        if self._retired:
+            await self._release()
+        slots = plan.new_slots()
+        plan.load_input(slots, validated_input)
+
+        chain_of = {name: i for i, chain in enumerate(chains) for name in chain.members}
+        waiting = [len({chain_of[source] for name in chain.members for source in plan.dependencies[name]} - {i})
+                   for i, chain in enumerate(chains)]
+        downstream: List[Set[int]] = [set() for _ in chains]
+        for i, chain in enumerate(chains):
+            for name in chain.members:
+                for source in plan.dependencies[name]:
+                    if chain_of[source] != i:
+                        downstream[chain_of[source]].add(i)
+
+        async def step(i: int) -> TaskResult:
+            # Les valeurs produites par les autres chaînes sont lues dans le tableau d'emplacements du coordinateur
+            chain_input = {f"{name}.{key}": value for name in chains[i].members
+                           for key, value in plan.read(slots, name).items()}
+            try:
+                return await self._run_chain(assignment[i], tokens[i], chain_input)
+            except Exception as e:
+                return TaskResult(success=False, error=f"Error in {chains[i].task_id}: {str(e)}")
+
+        running: Dict[asyncio.Future, int] = {}
+        ready = [i for i, count in enumerate(waiting) if count == 0]
+        try:
+            while ready or running:
+                for i in ready:
+                    running[asyncio.ensure_future(step(i))] = i
+                ready = []
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=running.__getitem__):
+                    i = running.pop(future)
+                    result = future.result()
+                    if not result.success:
+                        return result
+                    for name in chains[i].members:
+                        plan.write(slots, name, result.data)
+                    for j in sorted(downstream[i]):
+                        waiting[j] -= 1
+                        if waiting[j] == 0:
+                            ready.append(j)
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        try:
+            return TaskResult(success=True, data=composite.output_params.validate(plan.collect_output(slots)))
+        except ParameterValidationError as e:
+            return TaskResult(success=False, error=f"Output validation failed: {str(e)}")
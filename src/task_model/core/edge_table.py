@@ -0,0 +1,73 @@
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+Connection = Tuple[str, str, str, str]
+
+class EdgeTable:
+    # Table de connexions compacte : chaque nom est stocké une seule fois et chaque arête
+    # occupe quatre entiers dans des colonnes array('i') au lieu d'un tuple de quatre chaînes
+    __slots__ = ("_symbols", "_symbol_ids", "from_tasks", "from_params", "to_tasks", "to_params")
+
+    def __init__(self, connections: Iterable[Connection] = ()):
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self.from_tasks = array("i")
+        self.from_params = array("i")
+        self.to_tasks = array("i")
+        self.to_params = array("i")
+        for connection in connections:
+            self.append(connection)
+
+    def symbol_id(self, name: str) -> int:
+        symbol_id = self._symbol_ids.get(name)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[name] = len(self._symbols)
+            self._symbols.append(sys.intern(name))
+        return symbol_id
+
+    def symbol(self, symbol_id: int) -> str:
+        return self._symbols[symbol_id]
+
+    def append(self, connection: Connection):
+        from_task, from_param, to_task, to_param = connection
+        self.from_tasks.append(self.symbol_id(from_task))
+        self.from_params.append(self.symbol_id(from_param))
+        self.to_tasks.append(self.symbol_id(to_task))
+        self.to_params.append(self.symbol_id(to_param))
+
+    def extend(self, connections: Iterable[Connection]):
+        for connection in connections:
+            self.append(connection)
+
+    def indices(self, index: int) -> Tuple[int, int, int, int]:
+        return self.from_tasks[index], self.from_params[index], self.to_tasks[index], self.to_params[index]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Connection, List[Connection]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        symbols = self._symbols
+        return (symbols[self.from_tasks[index]], symbols[self.from_params[index]],
+                symbols[self.to_tasks[index]], symbols[self.to_params[index]])
+
+    def __len__(self):
+        return len(self.from_tasks)
+
+    def __iter__(self) -> Iterator[Connection]:
+        symbols = self._symbols
+        for from_task, from_param, to_task, to_param in zip(self.from_tasks, self.from_params, self.to_tasks, self.to_params):
+            yield symbols[from_task], symbols[from_param], symbols[to_task], symbols[to_param]
+
+    def __contains__(self, connection: Connection) -> bool:
+        return any(edge == tuple(connection) for edge in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (EdgeTable, list, tuple)):
+            return list(self) == [tuple(edge) for edge in other]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EdgeTable({list(self)})"
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.from_tasks, self.from_params, self.to_tasks, self.to_params))
@@ -0,0 +1,297 @@
+import heapq
+from typing import Any, Collection, Dict, FrozenSet, Iterable, List, Tuple
+from .base_task import BaseTask
+
+# Marque un emplacement du plan de données qui n'a pas (encore) reçu de valeur
+EMPTY = object()
+
+# (clé dans l'entrée validée du composite, emplacement)
+InputSlot = Tuple[str, int]
+# (clé locale dans l'entrée de la sous-tâche, emplacements candidats par ordre de priorité)
+SlotRead = Tuple[str, Tuple[int, ...]]
+# (clés candidates dans le résultat de la sous-tâche, emplacement)
+SlotWrite = Tuple[Tuple[str, ...], int]
+# (clé de sortie du composite, emplacement)
+OutputSlot = Tuple[str, int]
+# (indice de la connexion, clés candidates dans chaque élément produit par la source)
+StreamOutput = Tuple[int, Tuple[str, ...]]
+# (indice de la connexion, paramètre cible)
+StreamInput = Tuple[int, str]
+
+class ExecutionPlan:
+    # Chaque couple (tâche, paramètre) reçoit un indice fixe dans un tableau plat : une exécution lit et
+    # écrit ses valeurs par indice, les dictionnaires ne sont construits que pour appeler les sous-tâches
+    __slots__ = ("tasks", "order", "dependencies", "dependents", "slot_names", "input_slots", "reads", "writes", "output_slots",
+                 "trusted_inputs", "validated_outputs", "stream_outputs", "stream_inputs", "unthrottled")
+
+    def __init__(self, tasks: Dict[str, BaseTask], order: Tuple[str, ...], dependencies: Dict[str, FrozenSet[str]], dependents: Dict[str, Tuple[str, ...]],
+                 slot_names: Tuple[str, ...], input_slots: Tuple[InputSlot, ...], reads: Dict[str, Tuple[SlotRead, ...]],
+                 writes: Dict[str, Tuple[SlotWrite, ...]], output_slots: Tuple[OutputSlot, ...],
+                 trusted_inputs: Dict[str, FrozenSet[str]], validated_outputs: FrozenSet[str],
+                 stream_outputs: Dict[str, Tuple[StreamOutput, ...]], stream_inputs: Dict[str, Tuple[StreamInput, ...]],
+                 unthrottled: FrozenSet[str]):
+        object.__setattr__(self, "tasks", tasks)
+        object.__setattr__(self, "order", order)
+        object.__setattr__(self, "dependencies", dependencies)
+        object.__setattr__(self, "dependents", dependents)
+        object.__setattr__(self, "slot_names", slot_names)
+        object.__setattr__(self, "input_slots", input_slots)
+        object.__setattr__(self, "reads", reads)
+        object.__setattr__(self, "writes", writes)
+        object.__setattr__(self, "output_slots", output_slots)
+        object.__setattr__(self, "trusted_inputs", trusted_inputs)
+        object.__setattr__(self, "validated_outputs", validated_outputs)
+        object.__setattr__(self, "stream_outputs", stream_outputs)
+        object.__setattr__(self, "stream_inputs", stream_inputs)
+        object.__setattr__(self, "unthrottled", unthrottled)
+
+    @property
+    def streaming(self) -> bool:
+        return bool(self.unthrottled)
+
+    @property
+    def slot_count(self) -> int:
+        return len(self.slot_names)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ExecutionPlan is immutable")
+
+    def __reduce__(self):
+        return ExecutionPlan, tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ExecutionPlan(order={list(self.order)}, slots={self.slot_count})"
+
+    def new_slots(self) -> List[Any]:
+        return [EMPTY] * len(self.slot_names)
+
+    def load_input(self, slots: List[Any], validated_input: Dict[str, Any]):
+        for input_key, slot in self.input_slots:
+            if input_key in validated_input:
+                slots[slot] = validated_input[input_key]
+
+    def read(self, slots: List[Any], task_id: str) -> Dict[str, Any]:
+        subtask_input = {}
+        for local_key, candidates in self.reads[task_id]:
+            for slot in candidates:
+                value = slots[slot]
+                if value is not EMPTY:
+                    subtask_input[local_key] = value
+                    break
+        return subtask_input
+
+    def write(self, slots: List[Any], task_id: str, data: Dict[str, Any]):
+        for keys, slot in self.writes[task_id]:
+            for key in keys:
+                if key in data:
+                    slots[slot] = data[key]
+                    break
+
+    def collect_output(self, slots: List[Any]) -> Dict[str, Any]:
+        output_data = {}
+        for output_key, slot in self.output_slots:
+            value = slots[slot]
+            if value is not EMPTY:
+                output_data[output_key] = value
+        return output_data
+
+    def prune(self, outputs: Collection[str]) -> 'ExecutionPlan':
+        # Ne garde que les sous-tâches dont dépendent les sorties demandées, en remontant les emplacements lus
+        output_slot = dict(self.output_slots)
+        unknown = [key for key in outputs if key not in output_slot]
+        if unknown:
+            raise ValueError(f"Unknown outputs: {', '.join(sorted(unknown))}")
+        owner = {slot: task_id for task_id, task_writes in self.writes.items() for _, slot in task_writes}
+        producer = {edge_index: task_id for task_id, routes in self.stream_outputs.items() for edge_index, _ in routes}
+
+        needed = set()
+        pending = [owner[output_slot[key]] for key in outputs]
+        while pending:
+            task_id = pending.pop()
+            if task_id in needed:
+                continue
+            needed.add(task_id)
+            for _, candidates in self.reads[task_id]:
+                pending.extend(owner[slot] for slot in candidates if slot in owner)
+            pending.extend(producer[edge_index] for edge_index, _ in self.stream_inputs[task_id])
+
+        stream_inputs = {task_id: self.stream_inputs[task_id] for task_id in needed}
+        consumed = {edge_index for routes in stream_inputs.values() for edge_index, _ in routes}
+        stream_outputs = {task_id: tuple(route for route in self.stream_outputs[task_id] if route[0] in consumed) for task_id in needed}
+        requested = set(outputs)
+        return ExecutionPlan(
+            tasks={task_id: task for task_id, task in self.tasks.items() if task_id in needed},
+            order=tuple(task_id for task_id in self.order if task_id in needed),
+            dependencies={task_id: self.dependencies[task_id] for task_id in needed},
+            dependents={task_id: tuple(t for t in self.dependents[task_id] if t in needed) for task_id in needed},
+            slot_names=self.slot_names,
+            input_slots=self.input_slots,
+            reads={task_id: self.reads[task_id] for task_id in needed},
+            writes={task_id: self.writes[task_id] for task_id in needed},
+            output_slots=tuple(entry for entry in self.output_slots if entry[0] in requested),
+            trusted_inputs={task_id: self.trusted_inputs[task_id] for task_id in needed},
+            validated_outputs=self.validated_outputs & requested,
+            stream_outputs=stream_outputs,
+            stream_inputs=stream_inputs,
+            unthrottled=frozenset(task_id for task_id in needed
+                                  if stream_inputs[task_id] or stream_outputs[task_id]),
+        )
+
+    @classmethod
+    def build(cls, subtasks: Dict[str, BaseTask], connections: Iterable[Tuple[str, str, str, str]]) -> 'ExecutionPlan':
+        from .composite_task import CompositeTask
+        from .streaming_task import StreamingTask
+
+        connections = list(connections)
+        index = {task_id: i for i, task_id in enumerate(subtasks)}
+        upstream: Dict[str, set] = {task_id: set() for task_id in subtasks}
+        for from_task, _, to_task, _ in connections:
+            if from_task in index and to_task in index and from_task != to_task:
+                upstream[to_task].add(from_task)
+
+        order = cls._topological_order(index, upstream)
+        position = {task_id: i for i, task_id in enumerate(order)}
+
+        # Une connexion issue d'une StreamingTask devient une file : le consommateur démarre sans attendre la fin du producteur
+        stream_outputs: Dict[str, List[StreamOutput]] = {task_id: [] for task_id in subtasks}
+        stream_inputs: Dict[str, List[StreamInput]] = {task_id: [] for task_id in subtasks}
+        streamed = set()
+        for edge_index, (from_task, from_param, to_task, to_param) in enumerate(connections):
+            if from_task in index and to_task in index and isinstance(subtasks[from_task], StreamingTask):
+                stream_outputs[from_task].append((edge_index, cls._result_keys(from_task, subtasks[from_task], from_param)))
+                stream_inputs[to_task].append((edge_index, to_param))
+                streamed.add((from_task, to_task))
+
+        # Les arêtes qui remontent l'ordre ferment un cycle : elles ne créent pas de dépendance
+        dependencies = {task_id: frozenset(t for t in upstream[task_id]
+                                           if position[t] < position[task_id] and (t, task_id) not in streamed)
+                        for task_id in order}
+        dependents: Dict[str, List[str]] = {task_id: [] for task_id in order}
+        for task_id in order:
+            for from_task in sorted(dependencies[task_id], key=position.__getitem__):
+                dependents[from_task].append(task_id)
+        cls._check_stream_dependencies(position, dependencies, dependents, streamed)
+
+        # Emplacements : une entrée et une sortie par paramètre de chaque sous-tâche
+        slot_names: List[str] = []
+        input_slot: Dict[str, int] = {}
+        output_slot: Dict[Tuple[str, str], int] = {}
+        reads: Dict[str, Dict[str, List[int]]] = {}
+        writes = {}
+        for task_id, subtask in subtasks.items():
+            reads[task_id] = {}
+            for param in subtask.input_params.parameters.values():
+                input_key = f"{task_id}.{param.name}"
+                input_slot[input_key] = len(slot_names)
+                slot_names.append(f"in:{input_key}")
+                reads[task_id][param.name] = [input_slot[input_key]]
+            task_writes = []
+            for param in subtask.output_params.parameters.values():
+                output_slot[(task_id, param.name)] = len(slot_names)
+                slot_names.append(f"out:{task_id}.{param.name}")
+                task_writes.append((cls._result_keys(task_id, subtask, param.name), output_slot[(task_id, param.name)]))
+            writes[task_id] = tuple(task_writes)
+
+        # Une valeur reçue par connexion est prioritaire sur l'entrée du composite ; la dernière connexion l'emporte
+        edge_sources: Dict[str, Dict[str, List[str]]] = {task_id: {} for task_id in subtasks}
+        for from_task, from_param, to_task, to_param in connections:
+            if to_task not in reads or (from_task, to_task) in streamed or (from_task, from_param) not in output_slot:
+                continue
+            reads[to_task].setdefault(to_param, []).insert(0, output_slot[(from_task, from_param)])
+            edge_sources[to_task].setdefault(to_param, []).append(from_task)
+
+        # Une sous-tâche composite valide ses propres sorties ; les entrées du composite sont validées
+        # avec les mêmes types que ceux de la sous-tâche. Seules les valeurs venant d'une feuille sont à revérifier.
+        validates_output = {task_id: isinstance(subtask, CompositeTask) for task_id, subtask in subtasks.items()}
+        trusted_inputs = {}
+        for task_id in subtasks:
+            trusted = set(reads[task_id])
+            for to_param, sources in edge_sources[task_id].items():
+                if not all(validates_output[from_task] for from_task in sources):
+                    trusted.discard(to_param)
+            trusted_inputs[task_id] = frozenset(trusted)
+
+        output_slots = tuple((f"{task_id}.{param.name}", output_slot[(task_id, param.name)])
+                             for task_id in order for param in subtasks[task_id].output_params.parameters.values())
+        validated_outputs = frozenset(f"{task_id}.{param.name}" for task_id, subtask in subtasks.items()
+                                      if validates_output[task_id] for param in subtask.output_params.parameters.values())
+
+        return cls(
+            tasks=dict(subtasks),
+            order=tuple(order),
+            dependencies=dependencies,
+            dependents={task_id: tuple(targets) for task_id, targets in dependents.items()},
+            slot_names=tuple(slot_names),
+            input_slots=tuple(input_slot.items()),
+            reads={task_id: tuple((local_key, tuple(candidates)) for local_key, candidates in task_reads.items())
+                   for task_id, task_reads in reads.items()},
+            writes=writes,
+            output_slots=output_slots,
+            trusted_inputs=trusted_inputs,
+            validated_outputs=validated_outputs,
+            stream_outputs={task_id: tuple(routes) for task_id, routes in stream_outputs.items()},
+            stream_inputs={task_id: tuple(routes) for task_id, routes in stream_inputs.items()},
+            unthrottled=frozenset(task_id for pair in streamed for task_id in pair),
+        )
+
+    @staticmethod
+    def _check_stream_dependencies(position: Dict[str, int], dependencies: Dict[str, FrozenSet[str]], dependents: Dict[str, List[str]],
+                                   streamed: set):
+        # Un consommateur qui attend une tâche ne pouvant se terminer qu'après la fin du flux bloquerait le producteur
+        # dès que sa file est pleine (ex. un losange : le producteur alimente a et b, et b attend aussi a)
+        consumers: Dict[str, List[str]] = {}
+        for from_task, to_task in streamed:
+            consumers.setdefault(from_task, []).append(to_task)
+        for producer in sorted(consumers, key=position.__getitem__):
+            # Tâches qui ne peuvent se terminer qu'après le producteur : ses dépendants et les consommateurs de ses flux
+            after = set()
+            pending = [producer]
+            while pending:
+                task_id = pending.pop()
+                for next_task in list(dependents[task_id]) + consumers.get(task_id, []):
+                    if next_task not in after:
+                        after.add(next_task)
+                        pending.append(next_task)
+            for consumer in sorted(consumers[producer], key=position.__getitem__):
+                blocking = sorted(dependencies[consumer] & after, key=position.__getitem__)
+                if blocking:
+                    raise ValueError(f"Subtask {consumer} streams from {producer} but also waits for {blocking[0]}, "
+                                     f"which cannot finish before the stream ends")
+
+    @staticmethod
+    def _result_keys(task_id: str, subtask: BaseTask, param_name: str) -> Tuple[str, ...]:
+        # Une feuille aplatie garde son propre task_id : son résultat peut être préfixé par celui-ci plutôt que par son chemin
+        if subtask.task_id == task_id:
+            return (f"{task_id}.{param_name}", param_name)
+        return (f"{task_id}.{param_name}", f"{subtask.task_id}.{param_name}", param_name)
+
+    @staticmethod
+    def _topological_order(index: Dict[str, int], upstream: Dict[str, set]) -> List[str]:
+        # Algorithme de Kahn, départage par ordre d'insertion ; un cycle est rompu sur la première tâche restante
+        waiting = {task_id: len(deps) for task_id, deps in upstream.items()}
+        downstream: Dict[str, List[str]] = {task_id: [] for task_id in index}
+        for task_id, deps in upstream.items():
+            for from_task in deps:
+                downstream[from_task].append(task_id)
+
+        heap = [index[task_id] for task_id, count in waiting.items() if count == 0]
+        heapq.heapify(heap)
+        by_index = list(index)
+        order: List[str] = []
+        placed = set()
+        next_unplaced = 0
+        while len(order) < len(by_index):
+            if not heap:
+                while by_index[next_unplaced] in placed:
+                    next_unplaced += 1
+                heapq.heappush(heap, next_unplaced)
+            task_id = by_index[heapq.heappop(heap)]
+            if task_id in placed:
+                continue
+            order.append(task_id)
+            placed.add(task_id)
+            for to_task in downstream[task_id]:
+                waiting[to_task] -= 1
+                if waiting[to_task] == 0 and to_task not in placed:
+                    heapq.heappush(heap, index[to_task])
+        return order
@@ -0,0 +1,56 @@
+import hashlib
+import pickle
+import struct
+from typing import Any, Dict
+
+class FingerprintError(TypeError):
+    pass
+
+def _encode(value: Any, out: bytearray):
+    # Encodage canonique : les dictionnaires sont triés par clé pour ne pas dépendre de l'ordre d'insertion
+    if value is None:
+        out += b"N"
+    elif value is True or value is False:
+        out += b"T" if value else b"F"
+    elif isinstance(value, int):
+        data = str(value).encode()
+        out += b"i" + struct.pack("<I", len(data)) + data
+    elif isinstance(value, float):
+        out += b"f" + struct.pack("<d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        out += b"s" + struct.pack("<I", len(data)) + data
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        out += b"b" + struct.pack("<I", len(data)) + data
+    elif isinstance(value, (list, tuple)):
+        out += (b"l" if isinstance(value, list) else b"t") + struct.pack("<I", len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out += b"d" + struct.pack("<I", len(value))
+        for key in sorted(value, key=repr):
+            _encode(key, out)
+            _encode(value[key], out)
+    elif isinstance(value, (set, frozenset)):
+        items = [fingerprint_value(item) for item in value]
+        out += b"S" + struct.pack("<I", len(items))
+        for item in sorted(items):
+            out += item.encode()
+    else:
+        try:
+            data = pickle.dumps(value, protocol=4)
+        except Exception as e:
+            raise FingerprintError(f"Cannot fingerprint value of type {type(value).__name__}: {str(e)}")
+        out += b"p" + struct.pack("<I", len(data)) + data
+
+def fingerprint_value(value: Any) -> str:
+    out = bytearray()
+    _encode(value, out)
+    return hashlib.sha256(out).hexdigest()
+
+def fingerprint(task_id: str, data: Dict[str, Any]) -> str:
+    out = bytearray()
+    _encode(task_id, out)
+    _encode(data, out)
+    return hashlib.sha256(out).hexdigest()
@@ -0,0 +1,62 @@
+import gc
+import mmap
+import os
+import pickle
+import struct
+from typing import Iterator
+from .composite_task import CompositeTask
+
+# En-tête : signature puis version du format ; un fichier d'une autre version doit être régénéré
+MAGIC = b"TMGRAPH\0"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sH")
+
+class GraphFormatError(ValueError):
+    pass
+
+def _composites(task: CompositeTask) -> Iterator[CompositeTask]:
+    yield task
+    for subtask in task.subtasks.values():
+        if isinstance(subtask, CompositeTask):
+            yield from _composites(subtask)
+
+def save_graph(task: CompositeTask, path: str):
+    # Les plans sont compilés avant l'écriture : le fichier contient l'ordre d'exécution et les emplacements.
+    # Les sous-tâches sont référencées par leur classe (module et nom), qui doit être importable au chargement.
+    for composite in _composites(task):
+        composite.compile()
+    payload = pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION))
+        f.write(payload)
+    os.replace(temporary, path)
+
+def load_graph(path: str) -> CompositeTask:
+    # Le fichier est projeté en mémoire et désérialisé sans copie intermédiaire ;
+    # add_subtask, connect et la compilation du plan ne sont pas rejoués
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < _HEADER.size:
+                raise GraphFormatError(f"{path} is not a task graph file")
+            magic, version = _HEADER.unpack_from(mapped)
+            if magic != MAGIC:
+                raise GraphFormatError(f"{path} is not a task graph file")
+            if version != FORMAT_VERSION:
+                raise GraphFormatError(f"{path} uses graph format version {version}, expected {FORMAT_VERSION}")
+            # Le ramasse-miettes se déclencherait à répétition pendant la création des nombreux objets du graphe
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                with memoryview(mapped)[_HEADER.size:] as payload:
+                    task = pickle.loads(payload)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    if not isinstance(task, CompositeTask):
+        raise GraphFormatError(f"{path} does not contain a CompositeTask")
+    # Les signatures des plans mis à plat reposent sur l'identité des objets, qui change au chargement
+    for composite in _composites(task):
+        if composite.flatten and composite._plan is not None:
+            composite._plan_signature = composite._structure_signature()
+    return task
@@ -0,0 +1,117 @@
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+class GraphIndex:
+    # Listes d'adjacence par tâche et ordre topologique maintenu à chaque ajout d'arête (algorithme de Pearce et Kelly) :
+    # seule la zone de l'ordre comprise entre les deux extrémités d'une arête « à rebours » est parcourue et renumérotée.
+    # Les chargements en bloc passent par add_edges, qui recalcule l'ordre une seule fois.
+    __slots__ = ("successors", "predecessors", "rank")
+
+    def __init__(self):
+        self.successors: Dict[str, Set[str]] = {}
+        self.predecessors: Dict[str, Set[str]] = {}
+        self.rank: Dict[str, int] = {}
+
+    def add_node(self, node: str):
+        if node not in self.rank:
+            self.rank[node] = len(self.rank)
+            self.successors[node] = set()
+            self.predecessors[node] = set()
+
+    def add_edge(self, from_node: str, to_node: str) -> bool:
+        # Renvoie False si l'arête ferme un cycle ; elle n'est alors pas indexée, l'ordre restant topologique
+        if from_node == to_node:
+            return False
+        if to_node in self.successors[from_node]:
+            return True
+        rank = self.rank
+        lower, upper = rank[to_node], rank[from_node]
+        if upper < lower:
+            self._link(from_node, to_node)
+            return True
+
+        forward = self._search(to_node, self.successors, lambda r: r < upper, from_node)
+        if forward is None:
+            return False
+        backward = self._search(from_node, self.predecessors, lambda r: r > lower, None)
+
+        # Les nœuds atteints en remontant passent avant ceux atteints en descendant, sur les mêmes rangs
+        backward.sort(key=rank.__getitem__)
+        forward.sort(key=rank.__getitem__)
+        moved = backward + forward
+        for node, new_rank in zip(moved, sorted(rank[node] for node in moved)):
+            rank[node] = new_rank
+        self._link(from_node, to_node)
+        return True
+
+    def add_edges(self, edges: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        # Ajout en bloc : toutes les arêtes sont liées puis l'ordre est recalculé une fois (algorithme de Kahn),
+        # en O(V + E) quel que soit l'ordre d'arrivée. Renvoie les arêtes qui ferment un cycle, non indexées
+        # comme avec add_edge ; seules les arêtes entre tâches d'un cycle passent par add_edge, dans l'ordre reçu.
+        rank = self.rank
+        # (position dans `edges`, arête) : les arêtes rejetées sont renvoyées dans l'ordre reçu
+        rejected: List[Tuple[int, Tuple[str, str]]] = []
+        added: List[Tuple[int, str, str]] = []
+        successors = {node: set(targets) for node, targets in self.successors.items()}
+        for position, (from_node, to_node) in enumerate(edges):
+            if from_node == to_node:
+                rejected.append((position, (from_node, to_node)))
+            elif to_node not in successors[from_node]:
+                successors[from_node].add(to_node)
+                added.append((position, from_node, to_node))
+
+        waiting = {node: 0 for node in rank}
+        for targets in successors.values():
+            for to_node in targets:
+                waiting[to_node] += 1
+        # Départage par rang courant : l'ordre existant est conservé autant que possible
+        heap = [(rank[node], node) for node, count in waiting.items() if count == 0]
+        heapq.heapify(heap)
+        placed: List[str] = []
+        while heap:
+            _, node = heapq.heappop(heap)
+            placed.append(node)
+            for to_node in successors[node]:
+                waiting[to_node] -= 1
+                if waiting[to_node] == 0:
+                    heapq.heappush(heap, (rank[to_node], to_node))
+
+        # Les tâches restantes appartiennent à un cycle ou en dépendent : elles gardent leur ordre relatif, après les autres
+        placed_set = set(placed)
+        remaining = sorted((node for node in rank if node not in placed_set), key=rank.__getitem__)
+        for new_rank, node in enumerate(placed + remaining):
+            rank[node] = new_rank
+        deferred = []
+        for position, from_node, to_node in added:
+            if from_node in placed_set or to_node in placed_set:
+                self._link(from_node, to_node)
+            else:
+                deferred.append((position, from_node, to_node))
+        for position, from_node, to_node in deferred:
+            if not self.add_edge(from_node, to_node):
+                rejected.append((position, (from_node, to_node)))
+        rejected.sort()
+        return [edge for _, edge in rejected]
+
+    def _search(self, start: str, edges: Dict[str, Set[str]], within: Callable[[int], bool], target: Optional[str]) -> Optional[List[str]]:
+        rank = self.rank
+        visited = {start}
+        stack = [start]
+        found = []
+        while stack:
+            node = stack.pop()
+            found.append(node)
+            for neighbour in edges[node]:
+                if neighbour == target:
+                    return None
+                if neighbour not in visited and within(rank[neighbour]):
+                    visited.add(neighbour)
+                    stack.append(neighbour)
+        return found
+
+    def _link(self, from_node: str, to_node: str):
+        self.successors[from_node].add(to_node)
+        self.predecessors[to_node].add(from_node)
+
+    def order(self) -> List[str]:
+        return sorted(self.rank, key=self.rank.__getitem__)
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+class Span:
+    __slots__ = ("name", "category", "owner", "start", "duration", "queue_wait", "input_size", "output_size", "success")
+
+    def __init__(self, name: str, category: str, owner: str, start: float, duration: float, queue_wait: float = 0.0,
+                 input_size: Optional[int] = None, output_size: Optional[int] = None, success: bool = True):
+        self.name = name
+        self.category = category
+        self.owner = owner
+        self.start = start
+        self.duration = duration
+        self.queue_wait = queue_wait
+        self.input_size = input_size
+        self.output_size = output_size
+        self.success = success
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name}, category={self.category}, owner={self.owner}, duration={self.duration})"
+
+class Instrumentation:
+    # Interface des écouteurs : les horodatages viennent de time.perf_counter(), en secondes
+    def on_span(self, span: Span):
+        pass
+
+class SpanAggregator(Instrumentation):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats: Dict[tuple, Dict[str, float]] = {}
+
+    def on_span(self, span: Span):
+        key = (span.owner, span.name, span.category)
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = {"count": 0, "failures": 0, "total": 0.0, "min": span.duration,
+                                           "max": span.duration, "queue_wait": 0.0}
+            stats["count"] += 1
+            stats["failures"] += 0 if span.success else 1
+            stats["total"] += span.duration
+            stats["min"] = min(stats["min"], span.duration)
+            stats["max"] = max(stats["max"], span.duration)
+            stats["queue_wait"] += span.queue_wait
+
+    def summary(self) -> List[Dict[str, Any]]:
+        # Trié par temps cumulé décroissant : la sous-tâche la plus coûteuse en tête
+        with self._lock:
+            rows = [dict(stats, owner=owner, name=name, category=category, mean=stats["total"] / stats["count"])
+                    for (owner, name, category), stats in self.stats.items()]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+class ChromeTraceExporter(Instrumentation):
+    # Format "Trace Event" lisible par chrome://tracing et Perfetto
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def on_span(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_trace_events(self) -> List[Dict[str, Any]]:
+        pid = os.getpid()
+        lanes: Dict[str, int] = {}
+        events = []
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            tid = lanes.setdefault(span.owner, len(lanes) + 1)
+            args = {"queue_wait_us": span.queue_wait * 1e6, "success": span.success}
+            if span.input_size is not None:
+                args["input_size"] = span.input_size
+            if span.output_size is not None:
+                args["output_size"] = span.output_size
+            events.append({"name": span.name, "cat": span.category, "ph": "X", "ts": span.start * 1e6,
+                           "dur": span.duration * 1e6, "pid": pid, "tid": tid, "args": args})
+        for owner, tid in lanes.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": owner}})
+        return events
+
+    def export(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.to_trace_events(), "displayTimeUnit": "ms"}, f)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
@@ -0,0 +1,67 @@
+import asyncio
+import pickle
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from .base_task import BaseTask
+from .buffers import pack
+from .task_result import TaskResult
+
+# Résultat transmis entre processus : (succès, données, erreur, exception levée),
+# plus compact qu'un TaskResult sérialisé
+WireResult = Tuple[bool, Optional[Dict[str, Any]], Optional[str], bool]
+
+# Tâches déjà désérialisées dans ce processus de travail, indexées par jeton
+_worker_tasks: Dict[str, BaseTask] = {}
+_WORKER_CACHE_SIZE = 256
+
+def _execute(task: BaseTask, input_data: Dict[str, Any]) -> WireResult:
+    try:
+        result = asyncio.run(task.execute(input_data))
+    except Exception as e:
+        return False, None, str(e), True
+    return result.success, result.data, result.error, False
+
+def run_task(task: BaseTask, input_data: Dict[str, Any]) -> WireResult:
+    return _execute(task, input_data)
+
+def run_pickled_task(token: str, payload: bytes, input_data: Dict[str, Any]) -> WireResult:
+    task = _worker_tasks.get(token)
+    if task is None:
+        if len(_worker_tasks) >= _WORKER_CACHE_SIZE:
+            _worker_tasks.pop(next(iter(_worker_tasks)))
+        task = _worker_tasks[token] = pickle.loads(payload)
+    success, data, error, raised = _execute(task, input_data)
+    # Les grands tampons du résultat reviennent par mémoire partagée
+    return success, pack(data), error, raised
+
+class OffloadError(Exception):
+    pass
+
+class TaskOffloader:
+    def __init__(self, executor: Executor):
+        self.executor = executor
+        self._payloads: Dict[int, Tuple[BaseTask, str, bytes]] = {}
+
+    def _payload(self, task: BaseTask) -> Tuple[str, bytes]:
+        # La tâche est sérialisée une seule fois ; les processus de travail la gardent en cache par jeton.
+        # Appeler forget() si une tâche est modifiée après sa première exécution déportée.
+        cached = self._payloads.get(id(task))
+        if cached is None or cached[0] is not task:
+            cached = (task, uuid.uuid4().hex, pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL))
+            self._payloads[id(task)] = cached
+        return cached[1], cached[2]
+
+    def forget(self, task: BaseTask):
+        self._payloads.pop(id(task), None)
+
+    async def run(self, task: BaseTask, input_data: Dict[str, Any]) -> TaskResult:
+        loop = asyncio.get_event_loop()
+        if isinstance(self.executor, ProcessPoolExecutor):
+            token, payload = self._payload(task)
+            success, data, error, raised = await loop.run_in_executor(self.executor, run_pickled_task, token, payload, pack(input_data))
+        else:
+            success, data, error, raised = await loop.run_in_executor(self.executor, run_task, task, input_data)
+        if raised:
+            raise OffloadError(error)
+        return TaskResult(success=success, data=data, error=error)
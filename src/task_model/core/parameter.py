@@ -1,16 +1,26 @@
-from typing import Any, Dict, Optional, Type
+import sys
+from typing import Any, Collection, Dict, Optional, Tuple, Type
 
 class ParameterValidationError(Exception):
     pass
 
 class Parameter:
+    __slots__ = ("name", "type", "description", "default", "optional", "task_id")
+
     def __init__(self, name: str, type: Type, description: str = "", default: Any = None, optional: bool = False, task_id: Optional[str] = None):
-        self.name = name
+        # Les noms sont internés : les copies préfixées créées à chaque niveau d'imbrication partagent leurs chaînes
+        self.name = sys.intern(name)
         self.type = type
         self.description = description
         self.default = default
         self.optional = optional
-        self.task_id = task_id
+        self.task_id = sys.intern(task_id) if task_id is not None else None
+
+    def __reduce__(self):
+        return Parameter, (self.name, self.type, self.description, self.default, self.optional, self.task_id)
+
+    def __repr__(self) -> str:
+        return f"Parameter(name={self.name!r}, type={getattr(self.type, '__name__', self.type)}, optional={self.optional})"
 
     def get_full_name(self) -> str:
         return f"{self.task_id}.{self.name}" if self.task_id else self.name
@@ -19,20 +29,51 @@ class Parameter:
     def create(cls, name: str, type: Type, description: str = "", default: Any = None, optional: bool = False, task_id: Optional[str] = None):
         return cls(name=name, type=type, description=description, default=default, optional=optional, task_id=task_id)
 
+# (nom complet, nom court, Parameter) : type, caractère optionnel et valeur par défaut sont lus sur le
+# Parameter à chaque validation, une modification après coup est donc prise en compte
+_CompiledEntry = Tuple[str, str, Parameter]
+
 class ParameterSet:
+    __slots__ = ("parameters", "_compiled")
+
     def __init__(self, parameters: Dict[str, Parameter] = None):
         self.parameters: Dict[str, Parameter] = {}
+        self._compiled: Optional[Tuple[_CompiledEntry, ...]] = None
         if parameters:
             for param in parameters.values():
                 self.add(param)
 
     def add(self, param: Parameter):
-        self.parameters[param.get_full_name()] = param
+        self.parameters[sys.intern(param.get_full_name())] = param
+        self._compiled = None
 
-    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        validated_data = {}
+    def __getstate__(self) -> Dict[str, Parameter]:
+        # Le validateur compilé est reconstruit à la première validation
+        return self.parameters
+
+    def __setstate__(self, parameters: Dict[str, Parameter]):
+        self.parameters = parameters
+        self._compiled = None
+
+    def invalidate(self):
+        # À appeler après avoir modifié directement le dictionnaire `parameters`
+        self._compiled = None
+
+    def _compile(self) -> Tuple[_CompiledEntry, ...]:
+        entries = []
         for full_name, param in self.parameters.items():
             name = full_name.split('.')[-1]  # Obtenir le nom du paramètre sans préfixe
+            entries.append((full_name, name, param))
+        self._compiled = tuple(entries)
+        return self._compiled
+
+    def validate(self, data: Dict[str, Any], trusted_keys: Optional[Collection[str]] = None) -> Dict[str, Any]:
+        # Les valeurs dont le nom complet figure dans `trusted_keys` ont déjà été validées en amont
+        entries = self._compiled
+        if entries is None:
+            entries = self._compile()
+        validated_data = {}
+        for full_name, name, param in entries:
             if full_name in data:
                 value = data[full_name]
             elif name in data:
@@ -46,11 +87,19 @@ class ParameterSet:
             else:
                 continue
 
-            if not isinstance(value, param.type):
-                raise ParameterValidationError(f"Invalid type for {full_name}. Expected {param.type}, got {type(value)}")
+            expected_type = param.type
+            checked = expected_type is not object and expected_type is not Any
+            if checked and not (trusted_keys and full_name in trusted_keys) and not isinstance(value, expected_type):
+                raise ParameterValidationError(f"Invalid type for {full_name}. Expected {expected_type}, got {type(value)}")
             validated_data[full_name] = value
         return validated_data
 
+    def subset(self, keys: Collection[str]) -> 'ParameterSet':
+        # Les Parameter sont partagés avec l'ensemble d'origine
+        subset = ParameterSet()
+        subset.parameters = {full_name: param for full_name, param in self.parameters.items() if full_name in keys}
+        return subset
+
     def merge(self, other: 'ParameterSet'):
         for param in other.parameters.values():
             self.add(Parameter.create(
@@ -0,0 +1,134 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from .base_task import BaseTask
+from .fingerprint import FingerprintError, fingerprint
+from .task_result import TaskResult
+
+def _estimate_size(result: TaskResult) -> int:
+    # Estimation superficielle : l'objet, son dictionnaire et les clés/valeurs de premier niveau
+    size = sys.getsizeof(result)
+    if result.data:
+        size += sys.getsizeof(result.data)
+        for key, value in result.data.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+class ResultCache:
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, max_memory: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_memory = max_memory
+        self.clock = clock
+        # clé -> (résultat, date d'expiration, taille estimée), dans l'ordre LRU
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(task: BaseTask, input_data: Dict[str, Any]) -> Optional[str]:
+        # Le nom qualifié de la classe et l'identité de la tâche (configuration, structure d'un composite)
+        # distinguent deux tâches portant le même identifiant
+        identity = task.cache_key()
+        if identity is None:
+            return None
+        try:
+            return fingerprint(f"{type(task).__module__}.{type(task).__qualname__}:{task.task_id}",
+                               {"task": identity, "input": input_data})
+        except FingerprintError:
+            return None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    def _lookup(self, key: str) -> Optional[TaskResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires_at, _ = entry
+        if expires_at is not None and expires_at <= self.clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.memory -= size
+
+    def get(self, key: str) -> Optional[TaskResult]:
+        result = self._lookup(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: TaskResult):
+        # Seuls les résultats réussis sont mémorisés
+        if not result.success:
+            return
+        if key in self._entries:
+            self._remove(key)
+        size = _estimate_size(result)
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (result, expires_at, size)
+        self.memory += size
+        while self._entries and (len(self._entries) > self.max_size or
+                                 (self.max_memory is not None and self.memory > self.max_memory)):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get_or_execute(self, key: str, factory: Callable[[], Awaitable[TaskResult]]) -> TaskResult:
+        result = self._lookup(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        # Regrouper les requêtes identiques déjà en cours sur une seule exécution
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # L'exécution a sa propre tâche : l'annulation du demandeur qui l'a lancée n'interrompt pas les autres
+            pending = asyncio.ensure_future(factory())
+            self._in_flight[key] = pending
+            pending.add_done_callback(lambda done: self._settle(key, done))
+        return await asyncio.shield(pending)
+
+    def _settle(self, key: str, done: asyncio.Future):
+        # Appelé avant la reprise des demandeurs : le résultat est en cache lorsqu'ils le reçoivent
+        if self._in_flight.get(key) is done:
+            del self._in_flight[key]
+        # Consulter l'exception évite l'avertissement "exception never retrieved" si tous les demandeurs sont partis
+        if not done.cancelled() and done.exception() is None:
+            self.put(key, done.result())
+
+    def clear(self):
+        self._entries.clear()
+        self.memory = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "memory": self.memory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,70 @@
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+class ResultStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "fingerprint TEXT PRIMARY KEY, task_id TEXT NOT NULL, data BLOB NOT NULL, created REAL NOT NULL)"
+        )
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM results WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, fingerprint: str, task_id: str, data: Dict[str, Any]) -> bool:
+        try:
+            payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Résultat non sérialisable : il sera simplement recalculé à la prochaine exécution
+            return False
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (fingerprint, task_id, data, created) VALUES (?, ?, ?, ?)",
+                (fingerprint, task_id, sqlite3.Binary(payload), time.time()),
+            )
+            self._connection.commit()
+        return True
+
+    def __contains__(self, fingerprint: str) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM results WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def purge(self, task_id: Optional[str] = None):
+        with self._lock:
+            if task_id is None:
+                self._connection.execute("DELETE FROM results")
+            else:
+                self._connection.execute("DELETE FROM results WHERE task_id = ?", (task_id,))
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
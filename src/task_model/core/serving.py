@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from .base_task import BaseTask
+from .composite_task import CompositeTask
+from .task_result import TaskResult
+
+logger = logging.getLogger(__name__)
+
+class ServerOverloaded(Exception):
+    pass
+
+# (entrée, futur du demandeur, date d'arrivée)
+Request = Tuple[Dict[str, Any], asyncio.Future, float]
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class TaskServer:
+    # Sert une même tâche à de nombreux appelants : les requêtes arrivées dans la même fenêtre
+    # sont regroupées en un lot exécuté par execute_batch, avec un nombre borné de lots en parallèle
+    def __init__(self, task: BaseTask, max_batch_size: int = 32, batch_window: float = 0.002, max_concurrency: int = 4,
+                 max_pending: int = 1024, latency_samples: int = 10000):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        self.task = task
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_concurrency = max_concurrency
+        # Contrôle d'admission : au-delà de max_pending requêtes en attente ou en cours, les nouvelles sont refusées
+        self.max_pending = max_pending
+        self.pending = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._running: set = set()
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+        self.completed = 0
+        self.rejected = 0
+        self.batches = 0
+        self._started_at: Optional[float] = None
+
+    async def start(self):
+        if self._batcher is not None:
+            return
+        if isinstance(self.task, CompositeTask):
+            self.task.compile()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._started_at = time.perf_counter()
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+
+    async def stop(self):
+        # Les requêtes déjà admises sont terminées avant l'arrêt
+        if self._batcher is None:
+            return
+        # Les soumissions sont refusées avant l'envoi de la sentinelle : aucune requête ne peut arriver après elle
+        self._stopping = True
+        await self._queue.put(None)
+        await self._batcher
+        if self._running:
+            await asyncio.gather(*self._running)
+        while not self._queue.empty():
+            request = self._queue.get_nowait()
+            if request is not None:
+                _, future, _ = request
+                self.pending -= 1
+                if not future.done():
+                    future.set_result(TaskResult(success=False, error="TaskServer stopped"))
+        self._batcher = None
+        self._stopping = False
+
+    async def __aenter__(self) -> 'TaskServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def submit_nowait(self, input_data: Dict[str, Any]) -> asyncio.Future:
+        if self._batcher is None:
+            raise RuntimeError("TaskServer is not started")
+        if self._stopping:
+            raise RuntimeError("TaskServer is stopping")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ServerOverloaded(f"{self.pending} requests pending, limit is {self.max_pending}")
+        future = asyncio.get_event_loop().create_future()
+        self.pending += 1
+        self._queue.put_nowait((input_data, future, time.perf_counter()))
+        return future
+
+    async def submit(self, input_data: Dict[str, Any]) -> TaskResult:
+        return await self.submit_nowait(input_data)
+
+    async def _batch_loop(self):
+        loop = asyncio.get_event_loop()
+        stopping = False
+        while not stopping:
+            request = await self._queue.get()
+            if request is None:
+                break
+            batch: List[Request] = [request]
+            # Attendre au plus batch_window après la première requête pour compléter le lot
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                try:
+                    request = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            await self._slots.acquire()
+            running = asyncio.ensure_future(self._run_batch(batch))
+            self._running.add(running)
+            running.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Request]):
+        try:
+            try:
+                results = await self.task.execute_batch([input_data for input_data, _, _ in batch])
+            except Exception as e:
+                logger.error("Error executing batch of %d requests: %s", len(batch), e)
+                results = [TaskResult(success=False, error=str(e))] * len(batch)
+            if len(results) != len(batch):
+                results = [TaskResult(success=False, error=f"Expected {len(batch)} results, got {len(results)}")] * len(batch)
+            self.batches += 1
+            finished = time.perf_counter()
+            for (_, future, arrived), result in zip(batch, results):
+                self._latencies.append(finished - arrived)
+                if not future.done():
+                    future.set_result(result)
+            self.completed += len(batch)
+        finally:
+            self.pending -= len(batch)
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self._latencies)
+        elapsed = time.perf_counter() - self._started_at if self._started_at is not None else 0.0
+        return {
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "pending": self.pending,
+            "batches": self.batches,
+            "mean_batch_size": self.completed / self.batches if self.batches else 0.0,
+            "throughput": self.completed / elapsed if elapsed else 0.0,
+            "p50": _percentile(ordered, 0.50),
+            "p99": _percentile(ordered, 0.99),
+        }
@@ -0,0 +1,84 @@
+import asyncio
+from abc import abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional
+from .base_task import BaseTask
+from .task_result import TaskResult
+
+class StreamError(Exception):
+    pass
+
+_END = object()
+
+class Channel:
+    # File bornée entre deux sous-tâches : un producteur rapide attend que le consommateur libère de la place
+    def __init__(self, maxsize: int = 16):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._error: Optional[str] = None
+        self._closed = False
+        self._abandoned = False
+        self.items = 0
+
+    async def put(self, value: Any):
+        if self._closed:
+            raise StreamError("Cannot put on a closed channel")
+        if self._abandoned:
+            return
+        await self._queue.put(value)
+        self.items += 1
+
+    def close(self, error: Optional[str] = None):
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        if self._abandoned:
+            return
+        try:
+            self._queue.put_nowait(_END)
+        except asyncio.QueueFull:
+            # Le consommateur lira le marqueur de fin une fois la file vidée
+            asyncio.ensure_future(self._queue.put(_END))
+
+    def abandon(self):
+        # Le consommateur a terminé : les valeurs suivantes sont ignorées pour ne pas bloquer le producteur
+        self._abandoned = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __aiter__(self) -> 'Channel':
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._abandoned:
+            raise StopAsyncIteration
+        value = await self._queue.get()
+        if value is _END:
+            self._abandoned = True
+            if self._error is not None:
+                raise StreamError(self._error)
+            raise StopAsyncIteration
+        return value
+
+class StreamingTask(BaseTask):
+    @abstractmethod
+    def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        pass
+
+    async def execute(self, input_data: Dict[str, Any]) -> TaskResult:
+        # Hors d'un CompositeTask, les éléments produits sont rassemblés en listes par paramètre de sortie
+        collected: Dict[str, List[Any]] = {}
+        async for item in self.stream(input_data):
+            for key, value in item.items():
+                collected.setdefault(key, []).append(value)
+        return TaskResult(success=True, data=collected)
+
+    async def _validate_and_execute(self, input_data: Dict[str, Any]) -> TaskResult:
+        try:
+            validated_input = self.input_params.validate(input_data)
+            collected: Dict[str, List[Any]] = {}
+            async for item in self.stream(validated_input):
+                for key, value in self.output_params.validate(item).items():
+                    collected.setdefault(key, []).append(value)
+            return TaskResult(success=True, data=collected)
+        except Exception as e:
+            return TaskResult(success=False, error=str(e))
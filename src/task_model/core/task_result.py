@@ -1,10 +1,22 @@
 from typing import Dict, Any, Optional
 
 class TaskResult:
+    # Immuable : un même résultat peut être partagé entre plusieurs exécutions (cache, sous-tâches)
+    __slots__ = ("success", "data", "error")
+
     def __init__(self, success: bool, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
-        self.success = success
-        self.data = data
-        self.error = error
+        object.__setattr__(self, "success", success)
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "error", error)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("TaskResult is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("TaskResult is immutable")
+
+    def __reduce__(self):
+        return (TaskResult, (self.success, self.data, self.error))
 
     def __repr__(self) -> str:
         return f"TaskResult(success={self.success}, data={self.data}, error={self.error})"
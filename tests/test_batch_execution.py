@@ -0,0 +1,113 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.result_cache import ResultCache
+from task_model.core.task_result import TaskResult
+
+class BatchAddTask(BaseTask):
+    def __init__(self, task_id="add_task"):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+        self.batch_calls = 0
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={f"{self.task_id}.result": input_data["a"] + input_data["b"]})
+
+    async def execute_batch(self, inputs):
+        # Traitement colonne par colonne
+        self.batch_calls += 1
+        a = [item["a"] for item in inputs]
+        b = [item["b"] for item in inputs]
+        return [TaskResult(success=True, data={f"{self.task_id}.result": x + y}) for x, y in zip(a, b)]
+
+class MultiplyTask(BaseTask):
+    def __init__(self, task_id="multiply_task"):
+        super().__init__(task_id, "Multiply two numbers")
+        self.input_params.add(Parameter("x", int, "First number"))
+        self.input_params.add(Parameter("y", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Product of x and y"))
+
+    async def execute(self, input_data):
+        if input_data["y"] < 0:
+            raise ValueError("negative factor")
+        return TaskResult(success=True, data={f"{self.task_id}.result": input_data["x"] * input_data["y"]})
+
+def build_composite():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(BatchAddTask())
+    composite.add_subtask(MultiplyTask())
+    composite.connect("add_task", "result", "multiply_task", "x")
+    return composite
+
+@pytest.mark.asyncio
+async def test_default_execute_batch_falls_back_to_execute():
+    results = await MultiplyTask().execute_batch([{"x": 2, "y": 3}, {"x": 1, "y": -1}])
+    assert results[0].success and results[0].data["multiply_task.result"] == 6
+    assert not results[1].success and "negative factor" in results[1].error
+
+@pytest.mark.asyncio
+async def test_composite_batch_passes_whole_batches():
+    composite = build_composite()
+    inputs = [{"add_task.a": i, "add_task.b": 1, "multiply_task.y": 2} for i in range(100)]
+
+    results = await composite.execute_batch(inputs)
+
+    assert composite.subtasks["add_task"].batch_calls == 1
+    assert [r.data["multiply_task.result"] for r in results] == [(i + 1) * 2 for i in range(100)]
+
+@pytest.mark.asyncio
+async def test_composite_batch_isolates_failing_items():
+    composite = build_composite()
+    results = await composite.execute_batch([
+        {"add_task.a": 1, "add_task.b": 1, "multiply_task.y": 3},
+        {"add_task.a": "1", "add_task.b": 1, "multiply_task.y": 3},
+        {"add_task.a": 1, "add_task.b": 1, "multiply_task.y": -3},
+    ])
+
+    assert results[0].success and results[0].data["multiply_task.result"] == 6
+    assert not results[1].success and "Invalid type" in results[1].error
+    assert not results[2].success and "negative factor" in results[2].error
+
+class ThreadNameTask(BaseTask):
+    cpu_bound = True
+
+    def __init__(self, task_id="thread"):
+        super().__init__(task_id, "Report the running thread")
+        self.input_params.add(Parameter("value", int, "Value"))
+        self.output_params.add(Parameter("name", str, "Thread name"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"name": threading.current_thread().name})
+
+@pytest.mark.asyncio
+async def test_composite_batch_offloads_cpu_bound_subtasks():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(ThreadNameTask())
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="offload") as executor:
+        composite.executor = executor
+        results = await composite.execute_batch([{"thread.value": i} for i in range(4)])
+
+    assert all(result.success for result in results)
+    assert all(result.data["thread.name"].startswith("offload") for result in results)
+
+@pytest.mark.asyncio
+async def test_composite_batch_consults_the_result_cache():
+    class DeterministicAddTask(BatchAddTask):
+        deterministic = True
+
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(DeterministicAddTask())
+    composite.result_cache = ResultCache()
+
+    first = await composite.execute_batch([{"add_task.a": i, "add_task.b": 1} for i in range(3)])
+    second = await composite.execute_batch([{"add_task.a": i, "add_task.b": 1} for i in range(4)])
+
+    assert [r.data["add_task.result"] for r in second] == [1, 2, 3, 4]
+    assert [r.data for r in first] == [r.data for r in second[:3]]
+    assert composite.subtasks["add_task"].batch_calls == 2
+    assert composite.result_cache.stats()["hits"] == 3
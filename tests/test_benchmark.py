@@ -0,0 +1,25 @@
+import json
+import pytest
+from task_model.benchmark import SHAPES, compare, count_leaves, main, run_benchmark
+
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+def test_run_benchmark_reports_metrics(shape):
+    result = run_benchmark(shape, 4, iterations=5, warmup=1)
+
+    assert result["shape"] == shape
+    assert result["subtasks"] == count_leaves(SHAPES[shape](4))
+    assert result["executions_per_sec"] > 0
+    assert result["per_subtask_overhead_us"] > 0
+    assert result["peak_memory_bytes"] >= 0
+
+def test_compare_flags_regressions():
+    baseline = [{"shape": "chain", "size": 10, "options": {}, "per_subtask_overhead_us": 10.0}]
+    current = [{"shape": "chain", "size": 10, "options": {}, "per_subtask_overhead_us": 12.0}]
+    assert compare(current, baseline, tolerance=0.1)[0]["shape"] == "chain"
+    assert compare(current, baseline, tolerance=0.5) == []
+
+def test_cli_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+    assert main(["--shape", "chain", "--size", "3", "--iterations", "5", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert [r["shape"] for r in report["results"]] == ["chain"]
@@ -0,0 +1,94 @@
+import array
+import glob
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.buffers import SharedBuffer, pack
+from task_model.core.composite_task import CompositeTask
+from task_model.core.distributed import Coordinator, LocalTransport
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+MB = 1 << 20
+
+def spilled_files():
+    return set(glob.glob(os.path.join("/dev/shm", "task_model-*")))
+
+class ReverseTask(BaseTask):
+    cpu_bound = True
+
+    def __init__(self, task_id):
+        super().__init__(task_id, "Reverse a buffer")
+        self.input_params.add(Parameter("data", object, "Buffer"))
+        self.output_params.add(Parameter("data", object, "Reversed buffer"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"data": bytearray(input_data["data"])[::-1]})
+
+def fill(shared, value):
+    shared.view[:] = bytes([value]) * shared.size
+    return shared.size
+
+def test_large_buffers_travel_out_of_band():
+    value = {"bytes": b"a" * MB, "array": bytearray(b"b" * MB), "view": memoryview(b"c" * MB), "small": b"d"}
+    payload = pickle.dumps(pack(value))
+    assert len(payload) < 64 * 1024
+
+    restored = pickle.loads(payload)
+    assert restored["bytes"] == value["bytes"] and type(restored["bytes"]) is bytes
+    assert restored["array"] == value["array"]
+    assert restored["view"] == value["view"] and isinstance(restored["view"], memoryview)
+    assert restored["small"] == b"d"
+
+def test_typed_views_and_arrays_keep_their_layout():
+    doubles = array.array("d", range(20000))
+    matrix = memoryview(bytearray(doubles.tobytes())).cast("d", (100, 200))
+    value = {"view": memoryview(doubles), "matrix": matrix, "array": doubles}
+    payload = pickle.dumps(pack(value))
+    assert len(payload) < 64 * 1024
+
+    restored = pickle.loads(payload)
+    assert restored["view"].format == "d" and restored["view"].shape == (20000,)
+    assert restored["view"].tolist() == doubles.tolist()
+    assert restored["matrix"].shape == (100, 200) and restored["matrix"].tolist() == matrix.tolist()
+    assert type(restored["array"]) is array.array and restored["array"] == doubles
+
+def test_spilled_files_are_removed_once_loaded():
+    before = spilled_files()
+    pickle.loads(pickle.dumps(pack(bytearray(2 * MB))))
+    assert spilled_files() == before
+
+def test_shared_buffer_is_shared_with_other_processes():
+    shared = SharedBuffer(MB)
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(fill, shared, 7).result() == MB
+    assert bytes(shared.view[:4]) == b"\x07" * 4
+
+    path = shared.path
+    shared.release()
+    assert not os.path.exists(path)
+
+@pytest.mark.asyncio
+async def test_offloaded_subtasks_exchange_large_buffers():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(ReverseTask("reverse"))
+    data = bytes(range(256)) * (4 * MB // 256)
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        composite.executor = executor
+        result = await composite.execute({"reverse.data": data})
+
+    assert result.success, result.error
+    assert result.data["reverse.data"] == data[::-1]
+
+@pytest.mark.asyncio
+async def test_transport_exchanges_large_buffers():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(ReverseTask("reverse"))
+    data = bytearray(os.urandom(2 * MB))
+    with LocalTransport(workers=1) as transport:
+        result = await Coordinator(transport).execute(composite, {"reverse.data": data})
+
+    assert result.success, result.error
+    assert result.data["reverse.data"] == data[::-1]
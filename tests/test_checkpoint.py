@@ -0,0 +1,116 @@
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.checkpoint import CheckpointStore
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    def __init__(self, task_id, fail=False):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+        self.fail = fail
+        self.calls = 0
+
+    async def execute(self, input_data):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("transient failure")
+        return TaskResult(success=True, data={"result": input_data["a"] + input_data["b"]})
+
+def build_pipeline(store, fail=False):
+    composite = CompositeTask("pipeline", "Pipeline")
+    composite.add_subtask(AddTask("first"))
+    composite.add_subtask(AddTask("side"))
+    composite.add_subtask(AddTask("second", fail=fail))
+    composite.add_subtask(AddTask("third"))
+    composite.connect("first", "result", "second", "a")
+    composite.connect("second", "result", "third", "a")
+    composite.checkpoint_store = store
+    return composite
+
+INPUTS = {"first.a": 1, "first.b": 2, "side.a": 0, "side.b": 0, "second.b": 3, "third.b": 4}
+
+def test_store_round_trip_and_compaction(tmp_path):
+    path = str(tmp_path / "checkpoints.log")
+    with CheckpointStore(path) as store:
+        store.record("run", "first", {"result": 3})
+        store.record("run", "first", {"result": 4})
+        store.record("done", "first", {"result": 1})
+        store.complete("done")
+        assert store.load("run") == {"first": {"result": 4}}
+        assert "done" not in store and len(store) == 1
+        size = (tmp_path / "checkpoints.log").stat().st_size
+        store.compact()
+        assert (tmp_path / "checkpoints.log").stat().st_size < size
+        assert store.load("run") == {"first": {"result": 4}}
+
+def test_torn_record_is_discarded(tmp_path):
+    path = tmp_path / "checkpoints.log"
+    with CheckpointStore(str(path)) as store:
+        store.record("run", "first", {"result": 3})
+        store.record("run", "second", {"result": 6})
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with CheckpointStore(str(path)) as store:
+        assert store.load("run") == {"first": {"result": 3}}
+        store.record("run", "second", {"result": 6})
+    with CheckpointStore(str(path)) as store:
+        assert store.load("run") == {"first": {"result": 3}, "second": {"result": 6}}
+
+@pytest.mark.asyncio
+async def test_resume_reruns_only_failed_and_downstream_subtasks(tmp_path):
+    path = str(tmp_path / "checkpoints.log")
+    with CheckpointStore(path) as store:
+        result = await build_pipeline(store, fail=True).execute(INPUTS)
+        assert not result.success
+
+    # Nouveau processus simulé : nouvelles instances, même journal
+    with CheckpointStore(path) as store:
+        composite = build_pipeline(store)
+        result = await composite.execute(INPUTS)
+
+        assert result.success, result.error
+        assert result.data["third.result"] == 10
+        assert result.data["side.result"] == 0
+        calls = {task_id: task.calls for task_id, task in composite.subtasks.items()}
+        assert calls == {"first": 0, "side": 0, "second": 1, "third": 1}
+        assert len(store) == 0
+
+@pytest.mark.asyncio
+async def test_different_inputs_start_a_new_run(tmp_path):
+    with CheckpointStore(str(tmp_path / "checkpoints.log")) as store:
+        await build_pipeline(store, fail=True).execute(INPUTS)
+        composite = build_pipeline(store)
+        result = await composite.execute(dict(INPUTS, **{"first.a": 10}))
+
+        assert result.data["third.result"] == 19
+        assert composite.subtasks["first"].calls == 1
+
+@pytest.mark.asyncio
+async def test_pruned_run_keeps_checkpoints_of_failed_full_run(tmp_path):
+    def build_fork(store, fail=False):
+        # Toutes les entrées passent par "first" : le graphe élagué exige les mêmes entrées que le graphe complet
+        composite = CompositeTask("fork", "Fork")
+        composite.add_subtask(AddTask("first"))
+        composite.add_subtask(AddTask("second", fail=fail))
+        composite.add_subtask(AddTask("side"))
+        for target in ("second", "side"):
+            composite.connect("first", "result", target, "a")
+            composite.connect("first", "result", target, "b")
+        composite.checkpoint_store = store
+        return composite
+
+    inputs = {"first.a": 1, "first.b": 2}
+    with CheckpointStore(str(tmp_path / "checkpoints.log")) as store:
+        assert not (await build_fork(store, fail=True).execute(inputs)).success
+        pruned = await build_fork(store).execute(inputs, outputs=["side.result"])
+        assert pruned.success and pruned.data == {"side.result": 6}
+
+        composite = build_fork(store)
+        result = await composite.execute(inputs)
+        assert result.success, result.error
+        assert composite.subtasks["first"].calls == 0
+        assert len(store) == 0
@@ -0,0 +1,65 @@
+import pickle
+import sys
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.edge_table import EdgeTable
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    def __init__(self, task_id="add_task"):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={f"{self.task_id}.result": input_data["a"] + input_data["b"]})
+
+class MultiplyTask(BaseTask):
+    def __init__(self, task_id="multiply_task"):
+        super().__init__(task_id, "Multiply two numbers")
+        self.input_params.add(Parameter("x", int, "First number"))
+        self.input_params.add(Parameter("y", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Product of x and y"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={f"{self.task_id}.result": input_data["x"] * input_data["y"]})
+
+def test_parameter_and_task_result_are_slotted():
+    param = Parameter("a", int, "First number")
+    result = TaskResult(success=True, data={"a": 1})
+    assert not hasattr(param, "__dict__")
+    assert not hasattr(result, "__dict__")
+
+def test_task_result_is_immutable_and_picklable():
+    result = TaskResult(success=True, data={"a": 1})
+    with pytest.raises(AttributeError):
+        result.success = False
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored.success and restored.data == {"a": 1} and restored.error is None
+
+def test_nested_parameter_names_are_interned():
+    inner = CompositeTask("inner", "Inner Composite")
+    inner.add_subtask(AddTask())
+    outer = CompositeTask("outer", "Outer Composite")
+    outer.add_subtask(inner)
+
+    names = [name for name in outer.input_params.parameters]
+    assert names == ["inner.add_task.a", "inner.add_task.b"]
+    assert names[0] is sys.intern("inner.add_task.a")
+
+def test_edge_table_stores_integer_edges():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(AddTask())
+    composite.add_subtask(MultiplyTask())
+    composite.connect("add_task", "result", "multiply_task", "x")
+    composite.connect("add_task", "result", "multiply_task", "y")
+
+    table = composite.connections
+    assert isinstance(table, EdgeTable)
+    assert list(table) == [("add_task", "result", "multiply_task", "x"), ("add_task", "result", "multiply_task", "y")]
+    assert table[1] == ("add_task", "result", "multiply_task", "y")
+    assert table.indices(0)[0] == table.indices(1)[0]
+    assert table.nbytes() == 2 * 4 * table.from_tasks.itemsize
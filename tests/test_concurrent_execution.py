@@ -0,0 +1,78 @@
+import asyncio
+import time
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class SlowEchoTask(BaseTask):
+    active = 0
+    peak = 0
+
+    def __init__(self, task_id, delay=0.05):
+        super().__init__(task_id, "Echo after a delay")
+        self.delay = delay
+        self.input_params.add(Parameter("value", int, "Value to echo"))
+        self.output_params.add(Parameter("value", int, "Echoed value"))
+
+    async def execute(self, input_data):
+        SlowEchoTask.active += 1
+        SlowEchoTask.peak = max(SlowEchoTask.peak, SlowEchoTask.active)
+        await asyncio.sleep(self.delay)
+        SlowEchoTask.active -= 1
+        return TaskResult(success=True, data={f"{self.task_id}.value": input_data["value"]})
+
+class FailingTask(BaseTask):
+    def __init__(self, task_id="failing"):
+        super().__init__(task_id, "Always fails")
+        self.input_params.add(Parameter("value", int, "Ignored"))
+        self.output_params.add(Parameter("value", int, "Never produced"))
+
+    async def execute(self, input_data):
+        raise RuntimeError("boom")
+
+def build_fan_out(width, **kwargs):
+    composite = CompositeTask("fan_out", "Fan out", **kwargs)
+    composite.add_subtask(SlowEchoTask("source"))
+    for i in range(width):
+        composite.add_subtask(SlowEchoTask(f"branch{i}"))
+        composite.connect("source", "value", f"branch{i}", "value")
+    return composite
+
+@pytest.mark.asyncio
+async def test_concurrent_branches_overlap():
+    composite = build_fan_out(5, concurrent=True)
+
+    start = time.perf_counter()
+    result = await composite.execute({"source.value": 7})
+    elapsed = time.perf_counter() - start
+
+    assert result.success, result.error
+    assert all(result.data[f"branch{i}.value"] == 7 for i in range(5))
+    assert elapsed < 0.05 * 4  # chemin critique : source puis une branche
+
+@pytest.mark.asyncio
+async def test_max_concurrency_is_respected():
+    SlowEchoTask.peak = 0
+    composite = build_fan_out(6, concurrent=True, max_concurrency=2)
+
+    result = await composite.execute({"source.value": 1})
+
+    assert result.success, result.error
+    assert SlowEchoTask.peak == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_failure_is_returned():
+    composite = build_fan_out(2, concurrent=True)
+    composite.add_subtask(FailingTask())
+    composite.connect("source", "value", "failing", "value")
+
+    result = await composite.execute({"source.value": 1})
+
+    assert not result.success
+    assert "Error in subtask failing" in result.error
+
+def test_invalid_max_concurrency():
+    with pytest.raises(ValueError):
+        CompositeTask("composite", "Composite Task", max_concurrency=0)
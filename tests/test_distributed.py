@@ -0,0 +1,111 @@
+import gc
+import os
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.distributed import Coordinator, LocalTransport
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class IncrementTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Increment")
+        self.input_params.add(Parameter("value", int, "Input value"))
+        self.output_params.add(Parameter("value", int, "Incremented value"))
+        self.output_params.add(Parameter("pid", int, "Process that ran the task"))
+
+    async def execute(self, input_data):
+        if input_data["value"] < 0:
+            raise ValueError("value must be positive")
+        return TaskResult(success=True, data={"value": input_data["value"] + 1, "pid": os.getpid()})
+
+class JoinTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Join")
+        self.input_params.add(Parameter("left", int, "Left value"))
+        self.input_params.add(Parameter("right", int, "Right value"))
+        self.output_params.add(Parameter("value", int, "Sum"))
+        self.output_params.add(Parameter("pid", int, "Process that ran the task"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"value": input_data["left"] + input_data["right"], "pid": os.getpid()})
+
+def build_two_chains():
+    composite = CompositeTask("graph", "Two chains joined")
+    for branch in ("a", "b"):
+        for i in range(3):
+            composite.add_subtask(IncrementTask(f"{branch}{i}"))
+            if i:
+                composite.connect(f"{branch}{i - 1}", "value", f"{branch}{i}", "value")
+    composite.add_subtask(JoinTask("join"))
+    composite.connect("a2", "value", "join", "left")
+    composite.connect("b2", "value", "join", "right")
+    return composite
+
+@pytest.fixture(scope="module")
+def transport():
+    with LocalTransport(workers=2) as transport:
+        yield transport
+
+def test_chains_follow_linear_segments():
+    plan = build_two_chains().compile()
+    assert Coordinator.chains(plan) == [["a0", "a1", "a2"], ["b0", "b1", "b2"], ["join"]]
+
+@pytest.mark.asyncio
+async def test_distributed_result_matches_local_execution(transport):
+    composite = build_two_chains()
+    inputs = {"a0.value": 0, "b0.value": 10}
+    coordinator = Coordinator(transport)
+    result = await coordinator.execute(composite, inputs)
+    local = await composite.execute(inputs)
+
+    assert result.success, result.error
+    assert result.data["join.value"] == local.data["join.value"] == 16
+    pids = {task_id: result.data[f"{task_id}.pid"] for task_id in composite.subtasks}
+    assert os.getpid() not in pids.values()
+    # Chaque chaîne reste sur un seul processus ; les deux chaînes sont réparties
+    assert pids["a0"] == pids["a1"] == pids["a2"]
+    assert pids["b0"] == pids["b1"] == pids["b2"]
+    assert pids["a0"] != pids["b0"]
+
+@pytest.mark.asyncio
+async def test_tasks_are_sent_once_per_worker(transport):
+    composite = build_two_chains()
+    coordinator = Coordinator(transport)
+    for start in range(3):
+        result = await coordinator.execute(composite, {"a0.value": start, "b0.value": start})
+        assert result.data["join.value"] == 2 * start + 6
+    assert len(coordinator._delivered) == 3
+
+    composite.connect("a0", "value", "b1", "value")
+    result = await coordinator.execute(composite, {"a0.value": 0, "b0.value": 0})
+    assert result.success, result.error
+    assert result.data["b2.value"] == 3
+
+@pytest.mark.asyncio
+async def test_distributed_failures_are_reported(transport):
+    result = await Coordinator(transport).execute(build_two_chains(), {"a0.value": -1, "b0.value": 0})
+    assert not result.success
+    assert result.error == "Error in subtask a0: value must be positive"
+
+@pytest.mark.asyncio
+async def test_replaced_and_released_partitions_are_forgotten(transport):
+    coordinator = Coordinator(transport)
+    composite = build_two_chains()
+    await coordinator.execute(composite, {"a0.value": 0, "b0.value": 0})
+    old_tokens = set(coordinator._delivered)
+
+    composite.connect("a0", "value", "b1", "value")
+    await coordinator.execute(composite, {"a0.value": 0, "b0.value": 0})
+    assert not old_tokens & set(coordinator._delivered)
+    # Le processus de travail a aussi oublié la tâche : le jeton seul ne suffit plus
+    success, _, error, _ = await transport.run(0, next(iter(old_tokens)), None, {})
+    assert not success and error.startswith("Unknown task token")
+
+    del composite
+    gc.collect()
+    assert len(coordinator._partitions) == 0
+    other = build_two_chains()
+    result = await coordinator.execute(other, {"a0.value": 1, "b0.value": 1})
+    assert result.data["join.value"] == 8
+    assert len(coordinator._delivered) == 3
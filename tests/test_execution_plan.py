@@ -0,0 +1,68 @@
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class IncrementTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Increment a number")
+        self.input_params.add(Parameter("value", int, "Input number"))
+        self.output_params.add(Parameter("value", int, "Incremented number"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"value": input_data["value"] + 1})
+
+def test_compile_is_cached_and_invalidated():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(IncrementTask("first"))
+    plan = composite.compile()
+    assert composite.compile() is plan
+
+    composite.add_subtask(IncrementTask("second"))
+    plan_after_add = composite.compile()
+    assert plan_after_add is not plan
+
+    composite.connect("first", "value", "second", "value")
+    assert composite.compile() is not plan_after_add
+
+def test_plan_is_immutable():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(IncrementTask("first"))
+    plan = composite.compile()
+    with pytest.raises(AttributeError):
+        plan.order = ()
+
+@pytest.mark.asyncio
+async def test_plan_orders_subtasks_by_connections():
+    composite = CompositeTask("composite", "Composite Task")
+    # Insérées dans l'ordre inverse des dépendances
+    composite.add_subtask(IncrementTask("third"))
+    composite.add_subtask(IncrementTask("second"))
+    composite.add_subtask(IncrementTask("first"))
+    composite.connect("first", "value", "second", "value")
+    composite.connect("second", "value", "third", "value")
+
+    assert composite.compile().order == ("first", "second", "third")
+
+    result = await composite.execute({"first.value": 1})
+    assert result.success, result.error
+    assert result.data["third.value"] == 4
+
+def test_plan_assigns_one_slot_per_parameter():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(IncrementTask("first"))
+    composite.add_subtask(IncrementTask("second"))
+    composite.connect("first", "value", "second", "value")
+    plan = composite.compile()
+
+    assert plan.slot_names == ("in:first.value", "out:first.value", "in:second.value", "out:second.value")
+    # L'entrée de "second" lit d'abord la sortie de "first", puis l'entrée du composite
+    assert plan.reads["second"] == (("value", (1, 2)),)
+
+    slots = plan.new_slots()
+    plan.load_input(slots, {"first.value": 1, "second.value": 10})
+    assert plan.read(slots, "second") == {"value": 10}
+    plan.write(slots, "first", {"value": 2})
+    assert plan.read(slots, "second") == {"value": 2}
+    assert plan.collect_output(slots) == {"first.value": 2}
@@ -0,0 +1,116 @@
+import asyncio
+import time
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    def __init__(self, task_id="add_task"):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={f"{self.task_id}.result": input_data["a"] + input_data["b"]})
+
+class MultiplyTask(BaseTask):
+    def __init__(self, task_id="multiply_task"):
+        super().__init__(task_id, "Multiply two numbers")
+        self.input_params.add(Parameter("x", int, "First number"))
+        self.input_params.add(Parameter("y", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Product of x and y"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={f"{self.task_id}.result": input_data["x"] * input_data["y"]})
+
+class SleepTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Sleep")
+        self.input_params.add(Parameter("value", int, "Value"))
+        self.output_params.add(Parameter("value", int, "Same value"))
+
+    async def execute(self, input_data):
+        await asyncio.sleep(0.05)
+        return TaskResult(success=True, data={"value": input_data["value"]})
+
+def build_nested(flatten):
+    inner = CompositeTask("inner", "Inner Composite")
+    inner.add_subtask(AddTask())
+    inner.add_subtask(MultiplyTask())
+    inner.connect("add_task", "result", "multiply_task", "x")
+
+    outer = CompositeTask("outer", "Outer Composite", flatten=flatten)
+    outer.add_subtask(inner)
+    outer.add_subtask(AddTask("final_add"))
+    outer.connect("inner", "multiply_task.result", "final_add", "a")
+    return outer
+
+@pytest.mark.asyncio
+async def test_flattened_graph_matches_nested_execution():
+    inputs = {"inner.add_task.a": 2, "inner.add_task.b": 3, "inner.multiply_task.y": 4, "final_add.a": 0, "final_add.b": 5}
+
+    nested = await build_nested(False).execute(inputs)
+    flat_task = build_nested(True)
+    flat = await flat_task.execute(inputs)
+
+    assert flat.success, flat.error
+    assert flat.data == nested.data
+    assert flat.data["final_add.result"] == 25
+    assert flat_task.compile().order == ("inner.add_task", "inner.multiply_task", "final_add")
+
+def test_flattened_connections_are_rewritten():
+    _, connections = build_nested(True).flattened()
+    assert connections == [
+        ("inner.multiply_task", "result", "final_add", "a"),
+        ("inner.add_task", "result", "inner.multiply_task", "x"),
+    ]
+
+@pytest.mark.asyncio
+async def test_inner_connection_wins_over_outer_connection_when_flattened():
+    def build(flatten):
+        inner = CompositeTask("inner", "Inner Composite")
+        inner.add_subtask(AddTask("t1"))
+        inner.add_subtask(MultiplyTask("t2"))
+        inner.connect("t1", "result", "t2", "x")
+        outer = CompositeTask("outer", "Outer Composite", flatten=flatten)
+        outer.add_subtask(AddTask("source"))
+        outer.add_subtask(inner)
+        outer.connect("source", "result", "inner", "t2.x")
+        return outer
+
+    inputs = {"source.a": 50, "source.b": 50, "inner.t1.a": 0, "inner.t1.b": 1, "inner.t2.y": 1}
+    nested = await build(False).execute(inputs)
+    flat = await build(True).execute(inputs)
+
+    assert nested.success and flat.success, (nested.error, flat.error)
+    assert nested.data["inner.t2.result"] == 1
+    assert flat.data == nested.data
+
+def test_flattened_plan_follows_nested_changes():
+    outer = build_nested(True)
+    plan = outer.compile()
+    outer.subtasks["inner"].add_subtask(AddTask("extra"))
+    assert "inner.extra" in outer.compile().order
+    assert outer.compile() is not plan
+
+@pytest.mark.asyncio
+async def test_flattening_exposes_parallelism_across_levels():
+    def level(depth):
+        composite = CompositeTask(f"level{depth}", f"Level {depth}", concurrent=True, flatten=True)
+        composite.add_subtask(SleepTask("work"))
+        if depth:
+            composite.add_subtask(level(depth - 1))
+        return composite
+
+    outer = level(4)
+    inputs = {name: 1 for name in outer.input_params.parameters}
+    start = time.perf_counter()
+    result = await outer.execute(inputs)
+    elapsed = time.perf_counter() - start
+
+    assert result.success, result.error
+    assert len(outer.compile().order) == 5
+    assert elapsed < 0.05 * 3
@@ -0,0 +1,114 @@
+import logging
+import random
+import time
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.graph_index import GraphIndex
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class PassTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Pass")
+        self.input_params.add(Parameter("value", int, "Input value"))
+        self.output_params.add(Parameter("value", int, "Same value"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"value": input_data["value"]})
+
+def build(size):
+    composite = CompositeTask("graph", "Graph")
+    for i in range(size):
+        composite.add_subtask(PassTask(f"t{i}"))
+    return composite
+
+def circular_warnings(caplog):
+    return [record for record in caplog.records if "circular" in record.getMessage()]
+
+def test_order_stays_topological_as_edges_arrive():
+    graph = GraphIndex()
+    for node in "abcde":
+        graph.add_node(node)
+    edges = [("e", "d"), ("d", "c"), ("c", "b"), ("b", "a"), ("e", "a")]
+    assert all(graph.add_edge(*edge) for edge in edges)
+    order = graph.order()
+    assert all(order.index(from_node) < order.index(to_node) for from_node, to_node in edges)
+    assert not graph.add_edge("a", "e")
+    assert not graph.add_edge("c", "c")
+
+def test_only_real_cycles_are_reported(caplog):
+    composite = build(4)
+    with caplog.at_level(logging.WARNING):
+        # Diamant : deux chemins vers t3, sans cycle
+        composite.connect("t0", "value", "t1", "value")
+        composite.connect("t0", "value", "t2", "value")
+        composite.connect("t1", "value", "t3", "value")
+        composite.connect("t2", "value", "t3", "value")
+        assert circular_warnings(caplog) == []
+        composite.connect("t3", "value", "t0", "value")
+    assert len(circular_warnings(caplog)) == 1
+
+@pytest.mark.asyncio
+async def test_connect_many_matches_connect():
+    edges = [(f"t{i}", "value", f"t{i + 1}", "value") for i in range(5)]
+    bulk = build(6)
+    bulk.connect_many(edges)
+    single = build(6)
+    for edge in edges:
+        single.connect(*edge)
+
+    assert bulk.connections == single.connections
+    assert bulk.compile().order == single.compile().order
+    result = await bulk.execute({"t0.value": 7})
+    assert result.data["t5.value"] == 7
+
+def test_connect_many_validates_before_adding():
+    composite = build(2)
+    with pytest.raises(ValueError, match="Invalid task name: missing"):
+        composite.connect_many([("t0", "value", "t1", "value"), ("t1", "value", "missing", "value")])
+    assert len(composite.connections) == 0
+
+def test_large_graph_builds_quickly():
+    size = 10000
+    composite = build(size)
+    rng = random.Random(0)
+    # Arêtes ajoutées dans le désordre : l'ordre topologique est réorganisé au fil des ajouts
+    edges = [(f"t{i}", "value", f"t{i + 1}", "value") for i in range(size - 1)]
+    edges += [(f"t{a}", "value", f"t{b}", "value") for a, b in (sorted(rng.sample(range(size), 2)) for _ in range(4 * size))]
+    rng.shuffle(edges)
+
+    start = time.perf_counter()
+    composite.connect_many(edges)
+    elapsed = time.perf_counter() - start
+
+    assert len(composite.connections) == len(edges)
+    assert elapsed < 5
+
+def test_add_edges_rejects_the_same_edges_as_add_edge():
+    edges = [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "d"), ("e", "a"), ("d", "b")]
+    single, bulk = GraphIndex(), GraphIndex()
+    for node in "abcde":
+        single.add_node(node)
+        bulk.add_node(node)
+    rejected = [edge for edge in edges if not single.add_edge(*edge)]
+
+    assert bulk.add_edges(edges) == rejected == [("c", "a"), ("d", "d"), ("d", "b")]
+    assert bulk.successors == single.successors
+    order = bulk.order()
+    assert all(order.index(from_node) < order.index(to_node) for node in order for from_node, to_node in
+               ((node, target) for target in bulk.successors[node]))
+
+def test_reversed_edges_build_quickly():
+    size = 50001
+    composite = build(size)
+    # Puits d'abord : chaque arête remonte l'ordre courant, le pire cas de l'ordre maintenu arête par arête
+    edges = [(f"t{i}", "value", f"t{i + 1}", "value") for i in reversed(range(size - 1))]
+
+    start = time.perf_counter()
+    composite.connect_many(edges)
+    elapsed = time.perf_counter() - start
+
+    assert len(composite.connections) == len(edges)
+    assert composite.graph.order() == [f"t{i}" for i in range(size)]
+    assert elapsed < 2
@@ -0,0 +1,84 @@
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.graph_file import GraphFormatError, load_graph, save_graph
+from task_model.core.instrumentation import SpanAggregator
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    def __init__(self, task_id="add_task"):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"result": input_data["a"] + input_data["b"]})
+
+class MultiplyTask(BaseTask):
+    def __init__(self, task_id="multiply_task"):
+        super().__init__(task_id, "Multiply two numbers")
+        self.input_params.add(Parameter("x", int, "First number"))
+        self.input_params.add(Parameter("y", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Product of x and y"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"result": input_data["x"] * input_data["y"]})
+
+def build_nested(flatten=False):
+    inner = CompositeTask("inner", "Inner Composite")
+    inner.add_subtask(AddTask())
+    inner.add_subtask(MultiplyTask())
+    inner.connect("add_task", "result", "multiply_task", "x")
+
+    outer = CompositeTask("outer", "Outer Composite", flatten=flatten)
+    outer.add_subtask(inner)
+    outer.add_subtask(AddTask("final_add"))
+    outer.connect("inner", "multiply_task.result", "final_add", "a")
+    return outer
+
+INPUTS = {"inner.add_task.a": 2, "inner.add_task.b": 3, "inner.multiply_task.y": 4, "final_add.b": 5}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("flatten", [False, True])
+async def test_loaded_graph_runs_without_recompiling(tmp_path, flatten):
+    path = str(tmp_path / "graph.bin")
+    original = build_nested(flatten)
+    original.add_listener(SpanAggregator())
+    save_graph(original, path)
+
+    loaded = load_graph(path)
+    plan = loaded.compile()
+    assert plan.order == original.compile().order
+    assert loaded.connections == original.connections
+    assert loaded.listeners == []
+
+    result = await loaded.execute(INPUTS)
+    assert result.success, result.error
+    assert result.data["final_add.result"] == 25
+    assert loaded.compile() is plan
+
+@pytest.mark.asyncio
+async def test_loaded_graph_can_still_be_extended(tmp_path):
+    path = str(tmp_path / "graph.bin")
+    save_graph(build_nested(), path)
+
+    loaded = load_graph(path)
+    loaded.add_subtask(MultiplyTask("scale"))
+    loaded.connect("final_add", "result", "scale", "x")
+    result = await loaded.execute(dict(INPUTS, **{"scale.y": 2}))
+    assert result.data["scale.result"] == 50
+
+def test_incompatible_files_are_rejected(tmp_path):
+    path = tmp_path / "graph.bin"
+    path.write_bytes(b"not a graph")
+    with pytest.raises(GraphFormatError, match="not a task graph file"):
+        load_graph(str(path))
+
+    save_graph(build_nested(), str(path))
+    data = bytearray(path.read_bytes())
+    data[8] += 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(GraphFormatError, match="format version 2"):
+        load_graph(str(path))
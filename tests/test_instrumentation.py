@@ -0,0 +1,78 @@
+import asyncio
+import json
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.instrumentation import ChromeTraceExporter, SpanAggregator
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class SleepTask(BaseTask):
+    def __init__(self, task_id, delay):
+        super().__init__(task_id, "Sleep")
+        self.delay = delay
+        self.input_params.add(Parameter("value", int, "Value"))
+        self.output_params.add(Parameter("value", int, "Same value"))
+
+    async def execute(self, input_data):
+        await asyncio.sleep(self.delay)
+        return TaskResult(success=True, data={"value": input_data["value"]})
+
+def build_nested():
+    inner = CompositeTask("inner", "Inner Composite")
+    inner.add_subtask(SleepTask("slow", 0.02))
+    outer = CompositeTask("outer", "Outer Composite", concurrent=True, max_concurrency=1)
+    outer.add_subtask(inner)
+    outer.add_subtask(SleepTask("fast", 0.0))
+    outer.add_subtask(SleepTask("other", 0.0))
+    outer.connect("inner", "slow.value", "fast", "value")
+    return outer
+
+@pytest.mark.asyncio
+async def test_aggregator_identifies_slow_subtask():
+    outer = build_nested()
+    aggregator = SpanAggregator()
+    outer.add_listener(aggregator)
+
+    result = await outer.execute({"inner.slow.value": 1, "other.value": 2})
+
+    assert result.success, result.error
+    subtasks = [row for row in aggregator.summary() if row["category"] == "subtask"]
+    assert subtasks[0]["name"] in ("inner", "slow")
+    assert {(row["owner"], row["name"]) for row in subtasks} == {("outer", "inner"), ("outer", "fast"), ("outer", "other"), ("inner", "slow")}
+    categories = {row["category"] for row in aggregator.summary()}
+    assert {"validate_input", "validate_output", "composite"} <= categories
+    # Avec max_concurrency=1, "other" attend que "inner" libère la place
+    other = next(row for row in subtasks if row["name"] == "other")
+    assert other["queue_wait"] > 0.01
+
+@pytest.mark.asyncio
+async def test_chrome_trace_export(tmp_path):
+    outer = build_nested()
+    exporter = ChromeTraceExporter()
+    outer.add_listener(exporter)
+    await outer.execute({"inner.slow.value": 1, "other.value": 2})
+
+    path = tmp_path / "trace.json"
+    exporter.export(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert {e["name"] for e in complete} >= {"inner", "slow", "fast", "other", "outer"}
+    assert all(e["dur"] >= 0 for e in complete)
+
+@pytest.mark.asyncio
+async def test_listener_removal_stops_events():
+    outer = build_nested()
+    aggregator = SpanAggregator()
+    outer.add_listener(aggregator)
+    outer.remove_listener(aggregator)
+    await outer.execute({"inner.slow.value": 1, "other.value": 2})
+    assert aggregator.summary() == []
+
+@pytest.mark.asyncio
+async def test_leaf_validate_and_execute_spans():
+    task = SleepTask("leaf", 0.0)
+    aggregator = SpanAggregator()
+    task.add_listener(aggregator)
+    await task._validate_and_execute({"value": 1})
+    assert {row["category"] for row in aggregator.summary()} == {"validate_input", "execute", "validate_output"}
@@ -0,0 +1,76 @@
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    def __init__(self, task_id="add_task"):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+        self.calls = 0
+
+    async def execute(self, input_data):
+        self.calls += 1
+        return TaskResult(success=True, data={"result": input_data["a"] + input_data["b"]})
+
+class MultiplyTask(BaseTask):
+    def __init__(self, task_id="multiply_task"):
+        super().__init__(task_id, "Multiply two numbers")
+        self.input_params.add(Parameter("x", int, "First number"))
+        self.input_params.add(Parameter("y", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Product of x and y"))
+        self.calls = 0
+
+    async def execute(self, input_data):
+        self.calls += 1
+        return TaskResult(success=True, data={"result": input_data["x"] * input_data["y"]})
+
+def build_composite():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(AddTask())
+    composite.add_subtask(MultiplyTask())
+    composite.add_subtask(AddTask("unrelated"))
+    composite.connect("add_task", "result", "multiply_task", "x")
+    return composite
+
+@pytest.mark.asyncio
+async def test_only_required_subtasks_run():
+    composite = build_composite()
+    # Les entrées de la sous-tâche inutile ne sont pas exigées
+    result = await composite.execute({"add_task.a": 2, "add_task.b": 3, "multiply_task.y": 4}, outputs=["multiply_task.result"])
+
+    assert result.success, result.error
+    assert result.data == {"multiply_task.result": 20}
+    assert composite.subtasks["add_task"].calls == 1
+    assert composite.subtasks["unrelated"].calls == 0
+
+@pytest.mark.asyncio
+async def test_pruned_plan_is_cached_per_outputs():
+    composite = build_composite()
+    first = composite.prune(["add_task.result"])
+    assert composite.prune(("add_task.result",)) is first
+    assert first[0].order == ("add_task",)
+
+    composite.add_subtask(MultiplyTask("late"))
+    assert composite.prune(["add_task.result"]) is not first
+
+@pytest.mark.asyncio
+async def test_missing_required_input_is_still_reported():
+    result = await build_composite().execute({"add_task.a": 2, "multiply_task.y": 4}, outputs=["multiply_task.result"])
+    assert not result.success
+    assert "add_task.b" in result.error
+
+def test_unknown_outputs_are_rejected():
+    with pytest.raises(ValueError, match="Unknown outputs: missing.result"):
+        build_composite().prune(["missing.result"])
+
+@pytest.mark.asyncio
+async def test_execute_reports_unknown_outputs():
+    composite = build_composite()
+    result = await composite.execute({"add_task.a": 2, "add_task.b": 3, "multiply_task.y": 4}, outputs=["missing.result"])
+    assert not result.success
+    assert result.error == "Unknown outputs: missing.result"
+    assert composite.subtasks["add_task"].calls == 0
@@ -0,0 +1,49 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.task_result import TaskResult
+
+class SumOfSquaresTask(BaseTask):
+    cpu_bound = True
+
+    def __init__(self, task_id):
+        super().__init__(task_id, "Sum of squares")
+        self.input_params.add(Parameter("n", int, "Upper bound"))
+        self.output_params.add(Parameter("total", int, "Sum of squares below n"))
+        self.output_params.add(Parameter("pid", int, "Process that ran the task"))
+
+    async def execute(self, input_data):
+        if input_data["n"] < 0:
+            raise ValueError("n must be positive")
+        total = sum(i * i for i in range(input_data["n"]))
+        return TaskResult(success=True, data={"total": total, "pid": os.getpid()})
+
+def build_composite(width):
+    composite = CompositeTask("composite", "Composite Task", concurrent=True)
+    for i in range(width):
+        composite.add_subtask(SumOfSquaresTask(f"sum{i}"))
+    return composite
+
+@pytest.mark.asyncio
+async def test_cpu_bound_subtasks_run_in_process_pool():
+    composite = build_composite(4)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        composite.executor = executor
+        result = await composite.execute({f"sum{i}.n": 1000 for i in range(4)})
+
+    assert result.success, result.error
+    assert all(result.data[f"sum{i}.total"] == sum(j * j for j in range(1000)) for i in range(4))
+    assert os.getpid() not in {result.data[f"sum{i}.pid"] for i in range(4)}
+
+@pytest.mark.asyncio
+async def test_cpu_bound_errors_are_reported():
+    composite = build_composite(1)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        composite.executor = executor
+        result = await composite.execute({"sum0.n": -1})
+
+    assert not result.success
+    assert result.error == "Error in subtask sum0: n must be positive"
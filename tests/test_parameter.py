@@ -0,0 +1,73 @@
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter, ParameterSet, ParameterValidationError
+from task_model.core.task_result import TaskResult
+
+class DoubleTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Double a number")
+        self.input_params.add(Parameter("value", int, "Input number"))
+        self.output_params.add(Parameter("value", int, "Doubled number"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"value": input_data["value"] * 2})
+
+def test_validator_is_rebuilt_when_set_changes():
+    params = ParameterSet()
+    params.add(Parameter("a", int))
+    assert params.validate({"a": 1}) == {"a": 1}
+
+    params.add(Parameter("b", int, default=5))
+    assert params.validate({"a": 1}) == {"a": 1, "b": 5}
+
+    other = ParameterSet()
+    other.add(Parameter("c", str))
+    params.merge(other)
+    with pytest.raises(ParameterValidationError):
+        params.validate({"a": 1})
+
+def test_invalidate_after_parameter_change():
+    params = ParameterSet()
+    params.add(Parameter("a", int))
+    with pytest.raises(ParameterValidationError):
+        params.validate({})
+
+    params.parameters["a"].optional = True
+    params.invalidate()
+    assert params.validate({}) == {}
+
+def test_parameter_changes_apply_without_invalidate():
+    params = ParameterSet()
+    params.add(Parameter("a", int))
+    params.add(Parameter("b", int))
+    with pytest.raises(ParameterValidationError):
+        params.validate({"b": 1})
+
+    params.parameters["a"].optional = True
+    params.parameters["b"].default = 7
+    assert params.validate({}) == {"b": 7}
+
+def test_trusted_keys_skip_type_checks():
+    params = ParameterSet()
+    params.add(Parameter("a", int))
+    with pytest.raises(ParameterValidationError):
+        params.validate({"a": "1"})
+    assert params.validate({"a": "1"}, trusted_keys={"a"}) == {"a": "1"}
+
+@pytest.mark.asyncio
+async def test_trusted_composite_passes_validated_values_to_nested_composites():
+    inner = CompositeTask("inner", "Inner Composite")
+    inner.add_subtask(DoubleTask("double"))
+    outer = CompositeTask("outer", "Outer Composite", trusted=True)
+    outer.add_subtask(inner)
+    outer.add_subtask(DoubleTask("final"))
+    outer.connect("inner", "double.value", "final", "value")
+
+    plan = outer.compile()
+    assert plan.trusted_inputs["inner"] == frozenset({"double.value"})
+    assert plan.validated_outputs == frozenset({"inner.double.value"})
+
+    result = await outer.execute({"inner.double.value": 3})
+    assert result.success, result.error
+    assert result.data["final.value"] == 12
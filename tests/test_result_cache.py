@@ -0,0 +1,127 @@
+import asyncio
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.result_cache import ResultCache
+from task_model.core.task_result import TaskResult
+
+class SquareTask(BaseTask):
+    deterministic = True
+
+    def __init__(self, task_id="square"):
+        super().__init__(task_id, "Square a number")
+        self.input_params.add(Parameter("value", int, "Input number"))
+        self.output_params.add(Parameter("value", int, "Squared number"))
+        self.calls = 0
+
+    async def execute(self, input_data):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return TaskResult(success=True, data={"value": input_data["value"] ** 2})
+
+def test_lru_eviction_and_ttl():
+    now = [0.0]
+    cache = ResultCache(max_size=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", TaskResult(success=True, data={"x": 1}))
+    cache.put("b", TaskResult(success=True, data={"x": 2}))
+    assert cache.get("a") is not None  # "a" devient le plus récent
+    cache.put("c", TaskResult(success=True, data={"x": 3}))
+
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.evictions == 1
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+
+def test_memory_bound_and_failures_not_cached():
+    cache = ResultCache(max_memory=1)
+    cache.put("a", TaskResult(success=True, data={"x": 1}))
+    cache.put("b", TaskResult(success=False, error="nope"))
+    assert len(cache) == 0
+
+class CubeTask(SquareTask):
+    pass
+
+def test_key_is_stable_across_insertion_order():
+    square = SquareTask()
+    assert ResultCache.make_key(square, {"a": 1, "b": [1, 2]}) == ResultCache.make_key(square, {"b": [1, 2], "a": 1})
+    assert ResultCache.make_key(square, {"a": 1}) != ResultCache.make_key(SquareTask("other"), {"a": 1})
+    # Même identifiant, classes différentes
+    assert ResultCache.make_key(square, {"a": 1}) != ResultCache.make_key(CubeTask(), {"a": 1})
+    assert ResultCache.make_key(square, {"a": lambda: 1}) is None
+
+@pytest.mark.asyncio
+async def test_composite_memoizes_deterministic_subtasks():
+    square = SquareTask()
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(square)
+    composite.result_cache = ResultCache()
+
+    first = await composite.execute({"square.value": 3})
+    second = await composite.execute({"square.value": 3})
+
+    assert first.data == second.data == {"square.value": 9}
+    assert square.calls == 1
+    assert composite.result_cache.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    square = SquareTask()
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(square)
+    composite.result_cache = ResultCache()
+
+    results = await asyncio.gather(*[composite.execute({"square.value": 4}) for _ in range(10)])
+
+    assert all(r.data["square.value"] == 16 for r in results)
+    assert square.calls == 1
+    assert composite.result_cache.coalesced == 9
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_coalesced_waiters():
+    cache = ResultCache()
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return TaskResult(success=True, data={"value": 1})
+
+    owner = asyncio.ensure_future(cache.get_or_execute("k", factory))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(cache.get_or_execute("k", factory))
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    result = await waiter
+    assert result.success and result.data == {"value": 1}
+    assert owner.cancelled()
+    assert len(calls) == 1
+    assert "k" in cache
+
+class ScaleTask(BaseTask):
+    deterministic = True
+
+    def __init__(self, task_id, factor):
+        super().__init__(task_id, "Scale a number")
+        self.factor = factor
+        self.input_params.add(Parameter("value", int, "Input number"))
+        self.output_params.add(Parameter("value", int, "Scaled number"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"value": input_data["value"] * self.factor})
+
+@pytest.mark.asyncio
+async def test_shared_cache_distinguishes_task_configurations():
+    cache = ResultCache()
+    results = []
+    for factor in (2, 3):
+        composite = CompositeTask("composite", "Composite Task")
+        composite.add_subtask(ScaleTask("scale", factor))
+        composite.result_cache = cache
+        results.append(await composite.execute({"scale.value": 10}))
+
+    assert [result.data["scale.value"] for result in results] == [20, 30]
+    assert cache.stats()["hits"] == 0
@@ -0,0 +1,105 @@
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.result_store import ResultStore
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    deterministic = True
+
+    def __init__(self, task_id):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+        self.calls = 0
+
+    async def execute(self, input_data):
+        self.calls += 1
+        return TaskResult(success=True, data={"result": input_data["a"] + input_data["b"]})
+
+def build_chain(store):
+    composite = CompositeTask("chain", "Chain")
+    for task_id in ("first", "second", "third"):
+        composite.add_subtask(AddTask(task_id))
+    composite.connect("first", "result", "second", "a")
+    composite.connect("second", "result", "third", "a")
+    composite.result_store = store
+    return composite
+
+def test_store_round_trip(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        assert store.get("missing") is None
+        store.put("key", "task", {"result": [1, 2]})
+        assert store.get("key") == {"result": [1, 2]}
+        assert "key" in store and len(store) == 1
+        store.purge("task")
+        assert len(store) == 0
+
+@pytest.mark.asyncio
+async def test_incremental_rerun_skips_unchanged_subtasks(tmp_path):
+    path = str(tmp_path / "results.db")
+    inputs = {"first.a": 1, "first.b": 2, "second.b": 3, "third.b": 4}
+
+    with ResultStore(path) as store:
+        composite = build_chain(store)
+        result = await composite.execute(inputs)
+        assert result.data["third.result"] == 10
+
+    # Nouveau processus simulé : nouvelles instances, même base
+    with ResultStore(path) as store:
+        composite = build_chain(store)
+        result = await composite.execute(dict(inputs, **{"third.b": 40}))
+
+        assert result.success, result.error
+        assert result.data["third.result"] == 46
+        calls = {task_id: task.calls for task_id, task in composite.subtasks.items()}
+        assert calls == {"first": 0, "second": 0, "third": 1}
+        assert store.hits == 2
+
+class ScaleTask(BaseTask):
+    deterministic = True
+
+    def __init__(self, task_id, factor):
+        super().__init__(task_id, "Scale a number")
+        self.factor = factor
+        self.input_params.add(Parameter("x", int, "Input number"))
+        self.output_params.add(Parameter("y", int, "Scaled number"))
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"y": input_data["x"] * self.factor})
+
+def build_scale(store, factor):
+    composite = CompositeTask("scaled", "Scaled")
+    composite.add_subtask(ScaleTask("scale", factor))
+    composite.result_store = store
+    return composite
+
+@pytest.mark.asyncio
+async def test_task_configuration_is_part_of_the_key(tmp_path):
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        assert (await build_scale(store, 2).execute({"scale.x": 10})).data == {"scale.y": 20}
+        assert (await build_scale(store, 3).execute({"scale.x": 10})).data == {"scale.y": 30}
+        assert (await build_scale(store, 2).execute({"scale.x": 10})).data == {"scale.y": 20}
+        assert store.hits == 1
+
+@pytest.mark.asyncio
+async def test_nested_composite_structure_is_part_of_the_key(tmp_path):
+    def build(store, second):
+        inner = CompositeTask("inner", "Inner")
+        inner.add_subtask(AddTask("first"))
+        inner.add_subtask(AddTask("second"))
+        if second:
+            inner.connect("first", "result", "second", "a")
+        outer = CompositeTask("outer", "Outer")
+        outer.add_subtask(inner)
+        outer.result_store = store
+        return outer
+
+    inputs = {"inner.first.a": 1, "inner.first.b": 2, "inner.second.a": 0, "inner.second.b": 3}
+    with ResultStore(str(tmp_path / "results.db")) as store:
+        unconnected = await build(store, False).execute(inputs)
+        connected = await build(store, True).execute(inputs)
+    assert unconnected.data["inner.second.result"] == 3
+    assert connected.data["inner.second.result"] == 6
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.serving import ServerOverloaded, TaskServer
+from task_model.core.task_result import TaskResult
+
+class AddTask(BaseTask):
+    def __init__(self, task_id):
+        super().__init__(task_id, "Add two numbers")
+        self.input_params.add(Parameter("a", int, "First number"))
+        self.input_params.add(Parameter("b", int, "Second number"))
+        self.output_params.add(Parameter("result", int, "Sum of a and b"))
+        self.batch_sizes = []
+
+    async def execute(self, input_data):
+        return TaskResult(success=True, data={"result": input_data["a"] + input_data["b"]})
+
+    async def execute_batch(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        await asyncio.sleep(0.01)
+        return await super().execute_batch(inputs)
+
+def build_composite():
+    composite = CompositeTask("composite", "Composite Task")
+    composite.add_subtask(AddTask("first"))
+    composite.add_subtask(AddTask("second"))
+    composite.connect("first", "result", "second", "a")
+    return composite
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_micro_batched():
+    composite = build_composite()
+    async with TaskServer(composite, max_batch_size=8, batch_window=0.01) as server:
+        results = await asyncio.gather(*(server.submit({"first.a": i, "first.b": 1, "second.b": 10}) for i in range(20)))
+
+    assert [result.data["second.result"] for result in results] == [i + 11 for i in range(20)]
+    assert composite.subtasks["first"].batch_sizes == [8, 8, 4]
+    stats = server.stats()
+    assert stats["completed"] == 20 and stats["batches"] == 3
+    assert 0 < stats["p50"] <= stats["p99"]
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_failure():
+    async with TaskServer(build_composite(), batch_window=0.01) as server:
+        good, bad = await asyncio.gather(server.submit({"first.a": 1, "first.b": 2, "second.b": 3}),
+                                         server.submit({"first.a": "x", "first.b": 2, "second.b": 3}))
+    assert good.success and good.data["second.result"] == 6
+    assert not bad.success
+
+@pytest.mark.asyncio
+async def test_admission_control_rejects_excess_requests():
+    async with TaskServer(build_composite(), max_pending=2, batch_window=0.01) as server:
+        accepted = [server.submit_nowait({"first.a": i, "first.b": 0, "second.b": 0}) for i in range(2)]
+        with pytest.raises(ServerOverloaded):
+            server.submit_nowait({"first.a": 2, "first.b": 0, "second.b": 0})
+        results = await asyncio.gather(*accepted)
+
+    assert all(result.success for result in results)
+    assert server.stats()["rejected"] == 1
+    assert server.pending == 0
+
+@pytest.mark.asyncio
+async def test_batches_run_with_bounded_concurrency():
+    composite = build_composite()
+    async with TaskServer(composite, max_batch_size=1, batch_window=0, max_concurrency=2) as server:
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        await asyncio.gather(*(server.submit({"first.a": i, "first.b": 0, "second.b": 0}) for i in range(4)))
+        elapsed = loop.time() - start
+    # 4 lots de deux étapes de 10 ms, deux à la fois
+    assert elapsed >= 0.035
+
+@pytest.mark.asyncio
+async def test_submissions_during_shutdown_are_rejected():
+    server = TaskServer(build_composite(), batch_window=0.01)
+    await server.start()
+    accepted = server.submit_nowait({"first.a": 1, "first.b": 0, "second.b": 0})
+    stopping = asyncio.ensure_future(server.stop())
+    await asyncio.sleep(0)
+    with pytest.raises(RuntimeError):
+        server.submit_nowait({"first.a": 2, "first.b": 0, "second.b": 0})
+    await stopping
+
+    assert (await accepted).success
+    assert server.pending == 0
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+from task_model.core.base_task import BaseTask
+from task_model.core.composite_task import CompositeTask
+from task_model.core.parameter import Parameter
+from task_model.core.streaming_task import StreamingTask
+from task_model.core.task_result import TaskResult
+
+class CountTask(StreamingTask):
+    def __init__(self, task_id="count", fail_at=None):
+        super().__init__(task_id, "Count up to n")
+        self.input_params.add(Parameter("n", int, "Number of items"))
+        self.output_params.add(Parameter("value", int, "Current item"))
+        self.fail_at = fail_at
+        self.produced = 0
+
+    async def stream(self, input_data):
+        for i in range(input_data["n"]):
+            if i == self.fail_at:
+                raise ValueError("source exhausted")
+            self.produced += 1
+            yield {"value": i}
+
+class SquareStreamTask(StreamingTask):
+    def __init__(self, task_id="square"):
+        super().__init__(task_id, "Square each item")
+        self.input_params.add(Parameter("value", object, "Incoming items"))
+        self.output_params.add(Parameter("value", int, "Squared item"))
+
+    async def stream(self, input_data):
+        async for value in input_data["value"]:
+            yield {"value": value * value}
+
+class SumTask(BaseTask):
+    def __init__(self, task_id="sum", source=None, limit=None):
+        super().__init__(task_id, "Sum incoming items")
+        self.input_params.add(Parameter("values", object, "Incoming items"))
+        self.output_params.add(Parameter("total", int, "Sum of items"))
+        self.source = source
+        self.limit = limit
+        self.max_backlog = 0
+
+    async def execute(self, input_data):
+        total = 0
+        consumed = 0
+        async for value in input_data["values"]:
+            consumed += 1
+            total += value
+            if self.source is not None:
+                self.max_backlog = max(self.max_backlog, self.source.produced - consumed)
+            await asyncio.sleep(0)
+            if consumed == self.limit:
+                break
+        return TaskResult(success=True, data={"total": total})
+
+def build_pipeline(n_items, buffer_size=4, **kwargs):
+    count = CountTask(fail_at=kwargs.pop("fail_at", None))
+    total = SumTask(source=count, **kwargs)
+    composite = CompositeTask("pipeline", "Streaming pipeline")
+    composite.stream_buffer_size = buffer_size
+    composite.add_subtask(count)
+    composite.add_subtask(SquareStreamTask())
+    composite.add_subtask(total)
+    composite.connect("count", "value", "square", "value")
+    composite.connect("square", "value", "sum", "values")
+    return composite, total
+
+@pytest.mark.asyncio
+async def test_streaming_pipeline_with_backpressure():
+    composite, total = build_pipeline(1000)
+
+    result = await composite.execute({"count.n": 1000})
+
+    assert result.success, result.error
+    assert result.data["sum.total"] == sum(i * i for i in range(1000))
+    # Deux files de capacité 4 plus les éléments en cours de traitement
+    assert total.max_backlog <= 2 * 4 + 3
+
+@pytest.mark.asyncio
+async def test_early_consumer_exit_does_not_block_producer():
+    composite, _ = build_pipeline(1000, limit=3)
+
+    result = await asyncio.wait_for(composite.execute({"count.n": 1000}), timeout=5)
+
+    assert result.success, result.error
+    assert result.data["sum.total"] == 0 + 1 + 4
+
+@pytest.mark.asyncio
+async def test_producer_failure_is_reported():
+    composite, _ = build_pipeline(10, fail_at=5)
+
+    result = await asyncio.wait_for(composite.execute({"count.n": 10}), timeout=5)
+
+    assert not result.success
+    assert "source exhausted" in result.error
+
+@pytest.mark.asyncio
+async def test_standalone_streaming_task_collects_items():
+    result = await CountTask()._validate_and_execute({"n": 3})
+    assert result.success and result.data == {"value": [0, 1, 2]}
+
+class OffsetSumTask(SumTask):
+    def __init__(self, task_id):
+        super().__init__(task_id)
+        self.input_params.add(Parameter("other", int, "Offset"))
+
+    async def execute(self, input_data):
+        result = await super().execute(input_data)
+        return TaskResult(success=True, data={"total": result.data["total"] + input_data["other"]})
+
+@pytest.mark.asyncio
+async def test_streaming_diamond_is_rejected_at_compile_time():
+    # "b" lit le flux de "count" mais attend aussi "a", qui ne se termine qu'à la fin de ce même flux
+    composite = CompositeTask("diamond", "Streaming diamond")
+    composite.add_subtask(CountTask())
+    composite.add_subtask(SumTask("a"))
+    composite.add_subtask(OffsetSumTask("b"))
+    composite.connect("count", "value", "a", "values")
+    composite.connect("count", "value", "b", "values")
+    composite.connect("a", "total", "b", "other")
+
+    with pytest.raises(ValueError, match="b streams from count but also waits for a"):
+        composite.compile()
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(composite.execute({"count.n": 100}), timeout=5)